@@ -1,13 +1,29 @@
 #!/usr/bin/env python3
 """
 Neo4j MCP Server - Corrected FastMCP implementation
+
+Connection pool settings (environment):
+    NEO4J_POOL_SIZE     maximum pooled Bolt connections (default 50)
+    NEO4J_POOL_TIMEOUT  seconds to wait for a free pooled connection (default 30)
+    NEO4J_CONN_TIMEOUT  seconds allowed to open a new connection (default 5)
 """
 
 import os
+import re
+import json
+import asyncio
+import atexit
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from itertools import islice
+from typing import Optional, Dict, Any, List, Iterator, Tuple, Callable, Awaitable
+from cachetools import TTLCache
 from fastmcp import FastMCP
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver, RoutingControl, READ_ACCESS, WRITE_ACCESS
+from neo4j.graph import Node, Path, Relationship
 
 # Load environment variables from .env file
 try:
@@ -19,10 +35,25 @@
 except Exception as e:
     print(f"Could not load .env file: {e}")
 
+# Optional: NumPy enables the in-process PageRank fallback when GDS is not installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Setup logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(), format='%(levelname)s:%(name)s:%(message)s')
 logger = logging.getLogger(__name__)
 
+# Connection settings are read once; the driver is built from them on first use
+_NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+_NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+_NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "C0wb0ys1!")
+_NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+_NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+_NEO4J_POOL_TIMEOUT = float(os.getenv("NEO4J_POOL_TIMEOUT", "30"))
+_NEO4J_CONN_TIMEOUT = float(os.getenv("NEO4J_CONN_TIMEOUT", "5"))
+
 # Create FastMCP server
 mcp = FastMCP("neo4j-mcp-server")
 
@@ -31,1067 +62,1453 @@ def format_neo4j_result(record: Dict[str, Any]) -> str:
     if not record:
         return "Empty result"
     
+    _dict = dict
     formatted_parts = []
+    append = formatted_parts.append
     for key, value in record.items():
-        if isinstance(value, dict) and 'properties' in value:
-            # Handle node/relationship objects
-            props = value['properties']
-            if props:
-                prop_str = ", ".join([f"{k}: {v}" for k, v in props.items()])
-                formatted_parts.append(f"{key}: {{{prop_str}}}")
-            else:
-                formatted_parts.append(f"{key}: {{}}")
-        elif isinstance(value, dict):
-            # Handle other dictionaries
-            formatted_parts.append(f"{key}: {value}")
-        else:
-            # Handle simple values
-            formatted_parts.append(f"{key}: {value}")
+        # Exact type check: row values are plain dicts, never subclasses
+        if type(value) is _dict:
+            props = value.get('properties')
+            if props is not None:
+                # Handle node/relationship objects (see _plain_value), keeping the id the other tools take
+                kind = value.get('type') or ":".join(value.get('labels', ()))
+                prop_str = ", ".join(f"{k}: {v}" for k, v in props.items())
+                append(f"{key}: (id: {value.get('id')}{', ' if kind else ''}{kind}) {{{prop_str}}}")
+                continue
+        # Handle other dictionaries and simple values
+        append(f"{key}: {value}")
     
     return " | ".join(formatted_parts)
 
-def execute_neo4j_query(query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-    """Execute a Neo4j query using the same logic as test_neo4j_connection.py."""
+def _legacy_id(element_id: str) -> Optional[int]:
+    """The integer id that id(n) returns, read from the end of an element id (``4:<db>:<id>`` or ``<id>``)."""
+    try:
+        return int(element_id.rsplit(":", 1)[-1])
+    except ValueError:
+        return None
+
+def _plain_value(value: Any) -> Any:
+    """Convert a result value to plain data, turning nodes and relationships into ``{id, labels/type, properties}`` maps."""
+    if isinstance(value, Node):
+        return {"id": _legacy_id(value.element_id), "element_id": value.element_id, "labels": sorted(value.labels), "properties": dict(value)}
+    if isinstance(value, Relationship):
+        return {"id": _legacy_id(value.element_id), "element_id": value.element_id, "type": value.type, "properties": dict(value)}
+    if isinstance(value, Path):
+        return {"nodes": [_plain_value(node) for node in value.nodes], "relationships": [_plain_value(rel) for rel in value.relationships]}
+    if isinstance(value, list):
+        return [_plain_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain_value(item) for key, item in value.items()}
+    return value
+
+def _record_row(record) -> Dict[str, Any]:
+    """One result record as a dict of plain values; unlike record.data(), graph entities keep their ids and labels."""
+    return {key: _plain_value(value) for key, value in record.items()}
+
+@lru_cache(maxsize=256)
+def _scalar_row_template(keys: Tuple[str, ...]) -> str:
+    """Build (once per column set) a format string giving format_neo4j_result's output for rows of plain values."""
+    return " | ".join(f"{key.replace('{', '{{').replace('}', '}}')}: {{}}" for key in keys)
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+@lru_cache(maxsize=2048)
+def _safe_ident(name: str) -> str:
+    """Validate a label, relationship type or property key before it is interpolated into Cypher."""
+    if not isinstance(name, str) or not _IDENTIFIER_RE.fullmatch(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return name
+
+# Labels and relationship types present in the database: kind -> (names, fetched_at)
+_SCHEMA_NAMES: Dict[str, Tuple[frozenset, float]] = {}
+_SCHEMA_NAMES_TTL = 60.0
+_SCHEMA_NAME_QUERIES = {
+    "label": "CALL db.labels() YIELD label RETURN label AS name",
+    "relationship type": "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType AS name",
+}
+
+def _known_ident(kind: str, name: str) -> str:
+    """Validate ``name`` and require it to be an existing label or relationship type before it is interpolated."""
+    _safe_ident(name)
+    cached = _SCHEMA_NAMES.get(kind)
+    now = time.monotonic()
+    if cached is None or now - cached[1] > _SCHEMA_NAMES_TTL or name not in cached[0]:
+        # A miss re-reads the catalogue so names created since the last refresh are accepted
+        names = frozenset(execute_neo4j_query(_SCHEMA_NAME_QUERIES[kind], readonly=True, single_column="name"))
+        _SCHEMA_NAMES[kind] = (names, now)
+        if name not in names:
+            raise ValueError(f"Unknown {kind}: {name!r}")
+    return name
+
+def _known_label(name: str) -> str:
+    """Validate a node label against the labels in the database."""
+    return _known_ident("label", name)
+
+def _known_rel_type(name: str) -> str:
+    """Validate a relationship type against the types in the database."""
+    return _known_ident("relationship type", name)
+
+@lru_cache(maxsize=512)
+def _build_create_cypher(labels: Tuple[str, ...]) -> str:
+    """Build (once per label set) the CREATE statement that binds all properties as $props."""
+    label_string = ":".join(_safe_ident(label) for label in labels)
+    return f"CREATE (n:{label_string}) SET n = $props RETURN n"
+
+@lru_cache(maxsize=1024)
+def _props_fragment(keys: Tuple[str, ...], prefix: str = "param_") -> Tuple[str, Tuple[str, ...]]:
+    """Build (once per key set) a ``k: $param_k`` map-literal fragment and its parameter names."""
+    names = tuple(f"{prefix}{key}" for key in keys)
+    fragment = ", ".join(f"{_safe_ident(key)}: ${name}" for key, name in zip(keys, names))
+    return fragment, names
+
+# Fixed query texts shared by the tools and the startup plan-cache warmup
+_LIST_NODES_QUERY = "MATCH (n) WHERE NOT n:`__Stats` WITH n LIMIT $limit RETURN collect(n) AS nodes"
+_GET_NODE_BY_ID_QUERY = "MATCH (n) WHERE id(n) = $node_id RETURN n"
+_DELETE_NODE_QUERY = "MATCH (n) WHERE id(n) = $node_id DELETE n RETURN count(n) as deleted"
+_DETACH_DELETE_NODE_QUERY = "MATCH (n) WHERE id(n) = $node_id DETACH DELETE n RETURN count(n) as deleted"
+# SET a = map skips null entries, so one template covers every optional-field combination
+_CREATE_ACTOR_QUERY = "CREATE (a:Actor:Person) SET a = $props RETURN a"
+_BATCH_CREATE_ACTORS_QUERY = "UNWIND $rows AS r CREATE (a:Actor:Person) SET a = r RETURN a.name AS name"
+
+# Batch size for APOC-driven bulk updates (add_property_to_nodes)
+_APOC_BATCH_SIZE = int(os.getenv("NEO4J_APOC_BATCH_SIZE", "10000"))
+
+# Upper bound on rows pulled for open-ended queries (execute_query, get_node)
+_MAX_RESULT_ROWS = int(os.getenv("NEO4J_MAX_RESULT_ROWS", "1000"))
+_TRUNCATED_NOTICE = f"\n\n⚠️ Output truncated at {_MAX_RESULT_ROWS} rows"
+
+class Neo4jQueryError(Exception):
+    """Raised when Neo4j fails to run a query; the message is the driver's error text."""
+
+# Short-lived cache of read-only query results; write tools clear it on success
+_READ_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=int(os.getenv("NEO4J_READ_CACHE_TTL", "60")))
+_READ_CACHE_LOCK = threading.RLock()
+
+_READ_ONLY_QUERY_RE = re.compile(r"^\s*(MATCH|CALL\s+db\.|RETURN)\b", re.IGNORECASE)
+# Whole words only: a false positive runs a read on the writer, skips the read cache and clears it,
+# so property names such as n.created_at or n.removed_by must not count as write clauses
+_WRITE_CLAUSE_RE = re.compile(r"\b(?:CREATE|MERGE|SET|DELETE|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b", re.IGNORECASE)
+
+# Procedures may write (db.createLabel, apoc.refactor.*), so a query counts as read-only only
+# when every procedure it calls is one of these; CALL { ... } subqueries are checked by _WRITE_CLAUSE_RE
+_PROCEDURE_CALL_RE = re.compile(r"\bCALL\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+_READ_ONLY_PROCEDURES = frozenset(name.lower() for name in (
+    "db.labels", "db.relationshipTypes", "db.propertyKeys", "db.info", "db.ping",
+    "db.schema.visualization", "db.schema.nodeTypeProperties", "db.schema.relTypeProperties",
+    "db.index.fulltext.queryNodes", "db.index.fulltext.queryRelationships",
+    "db.index.vector.queryNodes", "db.index.vector.queryRelationships",
+))
+
+def _is_read_only_query(query: str) -> bool:
+    """Return True if the query reads from the graph, contains no write clause and calls only read-only procedures."""
+    return (
+        bool(_READ_ONLY_QUERY_RE.match(query))
+        and not _WRITE_CLAUSE_RE.search(query)
+        and all(name.lower() in _READ_ONLY_PROCEDURES for name in _PROCEDURE_CALL_RE.findall(query))
+    )
+
+# graph_statistics results go stale on a shorter clock than other reads
+_STATS_CACHE: TTLCache = TTLCache(maxsize=2, ttl=30)
+
+# Optional materialized aggregates, persisted on (:__Stats {key}) nodes and shared by every server process
+_MATERIALIZED_STATS = os.getenv("NEO4J_MATERIALIZED_STATS", "false").lower() in ("1", "true", "yes")
+_MATERIALIZED_STATS_TTL = int(os.getenv("NEO4J_MATERIALIZED_STATS_TTL", "300"))
+_READ_STATS_NODE_QUERY = "MATCH (s:`__Stats` {key: $key}) WHERE s.updated_at > timestamp() - $max_age_ms RETURN s.payload AS payload"
+_WRITE_STATS_NODE_QUERY = "MERGE (s:`__Stats` {key: $key}) SET s.payload = $payload, s.updated_at = timestamp()"
+_CLEAR_STATS_NODES_QUERY = "MATCH (s:`__Stats`) DELETE s"
+# Whether __Stats nodes may exist; starts True so the first write also clears entries left by other processes
+_STATS_NODES_PRESENT = True
+
+def _invalidate_read_cache() -> None:
+    """Drop every cached read result after a write."""
+    with _READ_CACHE_LOCK:
+        _READ_CACHE.clear()
+        _STATS_CACHE.clear()
+    global _STATS_NODES_PRESENT
+    if _MATERIALIZED_STATS and _STATS_NODES_PRESENT:
+        try:
+            execute_neo4j_query(_CLEAR_STATS_NODES_QUERY)
+            _STATS_NODES_PRESENT = False
+        except Neo4jQueryError as e:
+            logger.warning("Could not clear materialized stats: %s", e)
+
+# Shared driver: owns the Bolt connection pool and is reused by every tool call
+_DRIVER: Optional[Driver] = None
+_DRIVER_LOCK = threading.Lock()
+
+def get_driver() -> Driver:
+    """Return the shared Neo4j driver, creating it on first use."""
+    global _DRIVER
+    if _DRIVER is None:
+        with _DRIVER_LOCK:
+            if _DRIVER is None:
+                logger.debug("Connecting to Neo4j at %s as %s", _NEO4J_URI, _NEO4J_USER)
+                driver = GraphDatabase.driver(
+                    _NEO4J_URI,
+                    auth=(_NEO4J_USER, _NEO4J_PASSWORD),
+                    fetch_size=int(os.getenv("NEO4J_FETCH_SIZE", "1000")),
+                    max_connection_pool_size=_NEO4J_POOL_SIZE,
+                    connection_acquisition_timeout=_NEO4J_POOL_TIMEOUT,
+                    connection_timeout=_NEO4J_CONN_TIMEOUT,
+                    max_connection_lifetime=3600,
+                )
+                atexit.register(driver.close)
+                _DRIVER = driver
+    return _DRIVER
+
+def _collect_rows(result, limit: Optional[int] = None, single_column: Optional[str] = None) -> List[Any]:
+    """Result transformer: collect at most ``limit`` rows (or bare column values) inside the transaction."""
+    if single_column is not None:
+        if limit is None:
+            return result.value(single_column)
+        return [record[single_column] for record in islice(result, limit)]
+    return [_record_row(record) for record in islice(result, limit)]
+
+# Clauses Neo4j accepts only in an implicit (auto-commit) transaction, never in a managed one
+_IMPLICIT_TX_RE = re.compile(r"\bIN\s+(?:\d+\s+)?(?:CONCURRENT\s+)?TRANSACTIONS\b|\bUSING\s+PERIODIC\s+COMMIT\b", re.IGNORECASE)
+
+def _needs_implicit_transaction(query: str) -> bool:
+    """Return True if the query batches its own commits (CALL { ... } IN TRANSACTIONS, USING PERIODIC COMMIT)."""
+    return bool(_IMPLICIT_TX_RE.search(query))
+
+def execute_neo4j_query(query: str, parameters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, cache_read: bool = False, readonly: bool = False, single_column: Optional[str] = None) -> List[Any]:
+    """Execute a Neo4j query in a managed read or write transaction, keeping at most ``limit`` rows (dicts, or ``single_column`` values)."""
+    
+    cache_key = None
+    if cache_read:
+        try:
+            cache_key = (query, tuple(sorted((parameters or {}).items())), limit, single_column)
+            hash(cache_key)
+        except TypeError:
+            # Unhashable parameter values (lists, maps) are simply not cached
+            cache_key = None
+        if cache_key is not None:
+            with _READ_CACHE_LOCK:
+                cached = _READ_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
     
-    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-    user = os.getenv("NEO4J_USER", "neo4j")
-    password = os.getenv("NEO4J_PASSWORD", "C0wb0ys1!")
-    database = os.getenv("NEO4J_DATABASE", "neo4j")
+    try:
+        if _needs_implicit_transaction(query):
+            # Auto-commit: the query commits its own batches, so it cannot run inside a managed transaction
+            with get_driver().session(database=_NEO4J_DATABASE) as session:
+                rows = _collect_rows(session.run(query, parameters or {}), limit=limit, single_column=single_column)
+        else:
+            # The driver opens and closes the session itself and runs a managed transaction
+            # (retried on transient errors) routed to a reader or to the writer
+            rows = get_driver().execute_query(
+                query, parameters or {},
+                database_=_NEO4J_DATABASE,
+                routing_=RoutingControl.READ if readonly else RoutingControl.WRITE,
+                result_transformer_=partial(_collect_rows, limit=limit, single_column=single_column),
+            )
+    except Exception as e:
+        # Logged at DEBUG only: callers log what they surface, and availability probes fail by design
+        logger.debug("Query failed: %s: %s", type(e).__name__, e)
+        raise Neo4jQueryError(str(e)) from e
     
-    # Debug: Print what we're using for connection
-    logger.info(f"DEBUG: Connecting to Neo4j at {uri} as {user} to database {database}")
+    if cache_key is not None:
+        with _READ_CACHE_LOCK:
+            _READ_CACHE[cache_key] = rows
+    return rows
+
+def _materialized_rows(key: str, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Return the rows stored under ``key`` on a stats node, recomputing and storing them when missing or stale."""
+    payload = execute_neo4j_query(
+        _READ_STATS_NODE_QUERY, {"key": key, "max_age_ms": _MATERIALIZED_STATS_TTL * 1000},
+        readonly=True, single_column="payload",
+    )
+    if payload:
+        return json.loads(payload[0])
+    global _STATS_NODES_PRESENT
+    rows = execute_neo4j_query(query, parameters, readonly=True)
+    execute_neo4j_query(_WRITE_STATS_NODE_QUERY, {"key": key, "payload": json.dumps(rows, default=str)})
+    _STATS_NODES_PRESENT = True
+    return rows
+
+def _run_many_tx(tx, queries: List[str]) -> List[List[Dict[str, Any]]]:
+    """Transaction function: run each statement in turn and collect its rows."""
+    return [[_record_row(record) for record in tx.run(query)] for query in queries]
+
+def execute_neo4j_queries_batched(queries: List[str], readonly: bool = False) -> List[List[Dict[str, Any]]]:
+    """Run several statements in one session and one managed transaction, returning one row list per statement."""
+    try:
+        with get_driver().session(database=_NEO4J_DATABASE) as session:
+            execute = session.execute_read if readonly else session.execute_write
+            return execute(_run_many_tx, queries)
+    except Exception as e:
+        logger.debug("Batched query failed: %s: %s", type(e).__name__, e)
+        raise Neo4jQueryError(str(e)) from e
+
+def execute_neo4j_query_iter(query: str, parameters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, readonly: bool = False) -> Iterator[Dict[str, Any]]:
+    """Yield result rows one at a time instead of materializing them; errors are raised, not returned."""
     
     try:
-        # Create driver (same as test_neo4j_connection.py)
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-        
-        # Execute query (same as test_neo4j_connection.py)
-        with driver.session(database=database) as session:
+        # The session's access mode routes its auto-commit query to a reader or to the writer
+        with get_driver().session(database=_NEO4J_DATABASE, default_access_mode=READ_ACCESS if readonly else WRITE_ACCESS) as session:
             result = session.run(query, parameters or {})
-            return [dict(record) for record in result]
-            
+            for record in islice(result, limit):
+                yield _record_row(record)
     except Exception as e:
-        logger.error(f"Query failed: {e}")
-        logger.error(f"DEBUG: Full error details: {type(e).__name__}: {str(e)}")
-        return [{"error": str(e)}]
-    finally:
-        if 'driver' in locals():
-            driver.close()
+        logger.debug("Query failed: %s: %s", type(e).__name__, e)
+        raise Neo4jQueryError(str(e)) from e
+
+
+# Cache key for the CSR adjacency in _READ_CACHE, so writes and the read TTL invalidate it too
+_CSR_CACHE_KEY = ("__csr__",)
+
+def _read_csr_tx(tx) -> Tuple[List[Any], Any]:
+    """Transaction function: node names and an (E, 2) array of edge endpoints as positions into the names."""
+    index: Dict[int, int] = {}
+    names: List[Any] = []
+    for record in tx.run("MATCH (n) WHERE NOT n:`__Stats` RETURN id(n) AS id, n.name AS name"):
+        index[record["id"]] = len(names)
+        names.append(record["name"])
+    
+    def endpoints() -> Iterator[int]:
+        # Reads are not snapshot-isolated, so skip relationships to nodes created after the node pass
+        for record in tx.run("MATCH (u)-[]->(v) RETURN id(u) AS u, id(v) AS v"):
+            u, v = index.get(record["u"]), index.get(record["v"])
+            if u is not None and v is not None:
+                yield u
+                yield v
+    
+    edges = np.fromiter(endpoints(), dtype=np.int64).reshape(-1, 2)
+    return names, edges
+
+def _load_csr() -> Tuple[List[Any], Any, Any]:
+    """Stream the graph into CSR arrays: node names, ``indptr`` (V+1 row offsets) and ``indices`` (edge targets)."""
+    with _READ_CACHE_LOCK:
+        cached = _READ_CACHE.get(_CSR_CACHE_KEY)
+    if cached is not None:
+        return cached
+    
+    try:
+        with get_driver().session(database=_NEO4J_DATABASE) as session:
+            names, edges = session.execute_read(_read_csr_tx)
+    except Exception as e:
+        logger.debug("CSR load failed: %s: %s", type(e).__name__, e)
+        raise Neo4jQueryError(str(e)) from e
+    
+    order = np.argsort(edges[:, 0], kind="stable")
+    indptr = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0], minlength=len(names)), out=indptr[1:])
+    indices = edges[order, 1].astype(np.int32)
+    
+    csr = (names, indptr, indices)
+    with _READ_CACHE_LOCK:
+        _READ_CACHE[_CSR_CACHE_KEY] = csr
+    return csr
+
+def _pagerank_csr(indptr: Any, indices: Any, damping: float = 0.85, tolerance: float = 1e-6, max_iterations: int = 50) -> Any:
+    """Power-iteration PageRank over a CSR adjacency, redistributing dangling-node mass uniformly."""
+    n = len(indptr) - 1
+    out_degree = np.diff(indptr)
+    sources = np.repeat(np.arange(n), out_degree)
+    dangling = out_degree == 0
+    pr = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        contrib = np.where(dangling, 0.0, pr / np.maximum(out_degree, 1))
+        new_pr = damping * np.bincount(indices, weights=contrib[sources], minlength=n)
+        new_pr += (1.0 - damping + damping * pr[dangling].sum()) / n
+        converged = np.abs(new_pr - pr).sum() < tolerance
+        pr = new_pr
+        if converged:
+            break
+    return pr
+
+def _csr_pagerank_rows(tolerance: float, top_k: int = 10) -> List[Dict[str, Any]]:
+    """Top ``top_k`` PageRank rows computed in-process from the cached CSR adjacency."""
+    names, indptr, indices = _load_csr()
+    if not names:
+        return []
+    scores = _pagerank_csr(indptr, indices, tolerance=tolerance)
+    top = np.argsort(-scores)[:top_k]
+    return [{"node": names[i], "score": float(scores[i])} for i in top]
+
+_APOC_AVAILABLE: Optional[bool] = None
+
+def _apoc_available() -> bool:
+    """Return whether apoc.periodic.iterate is installed, probing the server only until it answers."""
+    global _APOC_AVAILABLE
+    if _APOC_AVAILABLE is None:
+        try:
+            rows = execute_neo4j_query('CALL apoc.help("periodic.iterate") YIELD name RETURN count(name) > 0 AS available', readonly=True, single_column="available")
+            _APOC_AVAILABLE = bool(rows and rows[0])
+        except Neo4jQueryError as e:
+            # A missing-procedure error is a definite "no"; connection errors are retried on the next call
+            if "apoc" not in str(e).lower():
+                return False
+            _APOC_AVAILABLE = False
+    return _APOC_AVAILABLE
+
+# (available, checked_at) from the last gds.list() probe; re-probed after _GDS_CHECK_TTL seconds
+_GDS_CHECK: Optional[Tuple[bool, float]] = None
+_GDS_CHECK_TTL = 60.0
+
+def _gds_available() -> bool:
+    """Return whether the Graph Data Science library answers gds.list(), probing at most once per TTL."""
+    global _GDS_CHECK
+    now = time.monotonic()
+    if _GDS_CHECK is None or now - _GDS_CHECK[1] > _GDS_CHECK_TTL:
+        try:
+            available = bool(execute_neo4j_query("CALL gds.list() YIELD name LIMIT 1", readonly=True))
+        except Neo4jQueryError:
+            available = False
+        _GDS_CHECK = (available, now)
+    return _GDS_CHECK[0]
+
+def invalidate_gds_cache() -> None:
+    """Forget the cached GDS probe so the next call checks the server again."""
+    global _GDS_CHECK
+    _GDS_CHECK = None
+
+def _handle_tool_errors(message: str) -> Callable[[Callable[..., str]], Callable[..., str]]:
+    """Decorate a tool so any exception it raises is logged and returned as ``❌ <message>: <error>``."""
+    def decorator(func: Callable[..., str]) -> Callable[..., str]:
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> str:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Exception in %s: %s", func.__name__, e)
+                return f"❌ {message}: {str(e)}"
+        return wrapper
+    return decorator
+
+def _offload(func: Callable[..., str]) -> Callable[..., Awaitable[str]]:
+    """Run a blocking tool in a worker thread so the event loop keeps serving other tool calls meanwhile."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> str:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+def warm_connection_pool() -> bool:
+    """Open the driver and fill part of the Bolt pool so the first tool call skips the handshakes."""
+    try:
+        driver = get_driver()
+        driver.verify_connectivity()
+    except Exception as e:
+        logger.warning("Could not connect to Neo4j at startup: %s", e)
+        return False
+    
+    def ping(_: int) -> None:
+        with driver.session(database=_NEO4J_DATABASE) as session:
+            session.run("RETURN 1").consume()
+    
+    # Concurrent sessions each need their own connection, which grows the pool
+    session_count = max(_NEO4J_POOL_SIZE // 2, 4)
+    try:
+        with ThreadPoolExecutor(max_workers=session_count) as executor:
+            list(executor.map(ping, range(session_count)))
+    except Exception as e:
+        logger.warning("Could not warm the connection pool: %s", e)
+    return True
+
+def warm_query_plans() -> None:
+    """Have Neo4j plan the fixed tool queries up front so their first real call hits the plan cache."""
+    warmups = [
+        (_LIST_NODES_QUERY, {"limit": 50}),
+        (_GET_NODE_BY_ID_QUERY, {"node_id": -1}),
+        (_DELETE_NODE_QUERY, {"node_id": -1}),
+        (_DETACH_DELETE_NODE_QUERY, {"node_id": -1}),
+    ]
+    for query, parameters in warmups:
+        try:
+            execute_neo4j_query(f"EXPLAIN {query}", parameters)
+        except Neo4jQueryError as e:
+            logger.warning("Could not warm query plan for %r: %s", query, e)
 
 @mcp.tool
 def echo(message: str) -> str:
     """Echo back the input message."""
-    logger.info(f"Echo tool called with message: {message}")
+    logger.info("Echo tool called with message: %s", message)
     return f"Echo: {message}"
 
 @mcp.tool
+@_handle_tool_errors("Error creating node")
 def create_node(labels: List[str], properties: Optional[Dict[str, Any]] = None) -> str:
     """Create a new Neo4j node with labels and properties."""
-    logger.info(f"Create node tool called with labels: {labels}, properties: {properties}")
+    logger.info("Create node tool called with labels: %s, properties: %s", labels, properties)
+    
+    if not labels:
+        return "❌ Specify at least one label"
     
     if not properties:
         properties = {}
     
-    try:
-        # Build Cypher query with proper parameter handling
-        label_string = ":".join(labels)
-        
-        # Create parameterized query for better security and special character handling
-        param_names = []
-        param_values = {}
-        
-        for key, value in properties.items():
-            param_name = f"param_{key}"
-            param_names.append(f"{key}: ${param_name}")
-            param_values[param_name] = value
-        
-        if param_names:
-            property_string = ", ".join(param_names)
-            query = f"CREATE (n:{label_string} {{{property_string}}}) RETURN n"
-        else:
-            query = f"CREATE (n:{label_string}) RETURN n"
-        
-        result = execute_neo4j_query(query, param_values)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Node created successfully with labels: {labels}, properties: {properties}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create node: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in create_node: {e}")
-        return f"❌ Error creating node: {str(e)}"
+    # Bind all properties as one map so every property shape reuses the same plan
+    query = _build_create_cypher(tuple(labels))
+    
+    rows = execute_neo4j_query(query, {"props": properties})
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Node created successfully with labels: {labels}, properties: {properties}"
+    else:
+        return "❌ Failed to create node: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error creating actor")
 def create_actor(name: str, nationality: str = "Unknown", birth_year: Optional[int] = None, known_for: Optional[List[str]] = None) -> str:
     """Create an actor node with proper encoding and special character handling."""
-    logger.info(f"Create actor tool called with name: {name}, nationality: {nationality}")
+    logger.info("Create actor tool called with name: %s, nationality: %s", name, nationality)
     
-    try:
-        # Build properties dictionary
-        properties = {
-            "name": name,
-            "occupation": "Actor",
-            "nationality": nationality
-        }
-        
-        if birth_year is not None:
-            properties["birth_year"] = birth_year
-        
-        if known_for is not None:
-            properties["known_for"] = known_for
-        
-        # Create parameterized query for better security
-        param_names = []
-        param_values = {}
-        
-        for key, value in properties.items():
-            param_name = f"param_{key}"
-            param_names.append(f"{key}: ${param_name}")
-            param_values[param_name] = value
-        
-        property_string = ", ".join(param_names)
-        query = f"CREATE (a:Actor:Person {{{property_string}}}) RETURN a"
-        
-        result = execute_neo4j_query(query, param_values)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Actor '{name}' created successfully"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create actor: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in create_actor: {e}")
-        return f"❌ Error creating actor: {str(e)}"
+    # Build properties dictionary
+    properties = {
+        "name": name,
+        "occupation": "Actor",
+        "nationality": nationality
+    }
+    
+    if birth_year is not None:
+        properties["birth_year"] = birth_year
+    
+    if known_for is not None:
+        properties["known_for"] = known_for
+    
+    # Same query text whichever optional fields are present
+    rows = execute_neo4j_query(_CREATE_ACTOR_QUERY, {"props": properties})
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Actor '{name}' created successfully"
+    else:
+        return "❌ Failed to create actor: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error creating movie-actor relationship")
 def create_movie_actor_relationship(movie_title: str, actor_name: str, role: Optional[str] = None) -> str:
     """Create a relationship between a movie and an actor."""
-    logger.info(f"Create movie-actor relationship tool called: {movie_title} -[STARRED_IN]-> {actor_name}")
+    logger.info("Create movie-actor relationship tool called: %s -[STARRED_IN]-> %s", movie_title, actor_name)
     
-    try:
-        # Build the relationship properties
-        properties = {}
-        if role:
-            properties["role"] = role
-        
-        # Create parameterized query
-        param_names = []
-        param_values = {
-            "movie_title": movie_title,
-            "actor_name": actor_name
-        }
-        
-        for key, value in properties.items():
-            param_name = f"param_{key}"
-            param_names.append(f"{key}: ${param_name}")
-            param_values[param_name] = value
-        
-        if param_names:
-            property_string = ", ".join(param_names)
-            query = f"""
-            MATCH (m:Movie {{title: $movie_title}})
-            MATCH (a:Actor {{name: $actor_name}})
-            CREATE (a)-[r:STARRED_IN {{{property_string}}}]->(m)
-            RETURN r
-            """
-        else:
-            query = f"""
-            MATCH (m:Movie {{title: $movie_title}})
-            MATCH (a:Actor {{name: $actor_name}})
-            CREATE (a)-[r:STARRED_IN]->(m)
-            RETURN r
-            """
-        
-        result = execute_neo4j_query(query, param_values)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            role_info = f" as {role}" if role else ""
-            return f"✅ Relationship created: {actor_name} -[STARRED_IN]-> {movie_title}{role_info}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create relationship: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in create_movie_actor_relationship: {e}")
-        return f"❌ Error creating movie-actor relationship: {str(e)}"
+    # Build the relationship properties
+    properties = {}
+    if role:
+        properties["role"] = role
+    
+    # Relationship properties are bound as one map, so the role does not change the query text
+    query = """
+    MATCH (m:Movie {title: $movie_title})
+    MATCH (a:Actor {name: $actor_name})
+    CREATE (a)-[r:STARRED_IN]->(m)
+    SET r = $props
+    RETURN r
+    """
+    param_values = {
+        "movie_title": movie_title,
+        "actor_name": actor_name,
+        "props": properties
+    }
+    
+    rows = execute_neo4j_query(query, param_values)
+    
+    if rows:
+        _invalidate_read_cache()
+        role_info = f" as {role}" if role else ""
+        return f"✅ Relationship created: {actor_name} -[STARRED_IN]-> {movie_title}{role_info}"
+    else:
+        return "❌ Failed to create relationship: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error in batch create actors")
 def batch_create_actors(actors_data: List[Dict[str, Any]]) -> str:
     """Create multiple actors in a batch operation."""
-    logger.info(f"Batch create actors tool called with {len(actors_data)} actors")
+    logger.info("Batch create actors tool called with %s actors", len(actors_data))
+    
+    # One row per actor; null optional fields are simply not set by SET a = r
+    actor_rows = [
+        {
+            "name": actor_data.get("name", ""),
+            "occupation": "Actor",
+            "nationality": actor_data.get("nationality", "Unknown"),
+            "birth_year": actor_data.get("birth_year"),
+            "known_for": actor_data.get("known_for"),
+        }
+        for actor_data in actors_data
+    ]
     
+    # Single round-trip and a single cached plan for the whole batch
     try:
+        rows = execute_neo4j_query(_BATCH_CREATE_ACTORS_QUERY, {"rows": actor_rows})
+        _invalidate_read_cache()
+        results = [f"✅ Created actor: {record['name']}" for record in rows]
+        created_count = len(results)
+    except Neo4jQueryError as e:
+        logger.error("Failed to create actors: %s", e)
+        results = [f"❌ Failed to create actors: {e}"]
         created_count = 0
-        failed_count = 0
-        results = []
-        
-        for actor_data in actors_data:
-            try:
-                name = actor_data.get("name", "")
-                nationality = actor_data.get("nationality", "Unknown")
-                birth_year = actor_data.get("birth_year")
-                known_for = actor_data.get("known_for")
-                
-                # Build properties
-                properties = {
-                    "name": name,
-                    "occupation": "Actor",
-                    "nationality": nationality
-                }
-                
-                if birth_year is not None:
-                    properties["birth_year"] = birth_year
-                
-                if known_for is not None:
-                    properties["known_for"] = known_for
-                
-                # Create parameterized query
-                param_names = []
-                param_values = {}
-                
-                for key, value in properties.items():
-                    param_name = f"param_{key}"
-                    param_names.append(f"{key}: ${param_name}")
-                    param_values[param_name] = value
-                
-                property_string = ", ".join(param_names)
-                query = f"CREATE (a:Actor:Person {{{property_string}}}) RETURN a"
-                
-                result = execute_neo4j_query(query, param_values)
-                
-                if result and len(result) > 0 and "error" not in result[0]:
-                    created_count += 1
-                    results.append(f"✅ Created actor: {name}")
-                else:
-                    failed_count += 1
-                    results.append(f"❌ Failed to create actor: {name}")
-                    
-            except Exception as e:
-                failed_count += 1
-                results.append(f"❌ Error creating actor {actor_data.get('name', 'Unknown')}: {str(e)}")
-        
-        summary = f"Batch operation completed: {created_count} created, {failed_count} failed"
-        return f"{summary}\n\n" + "\n".join(results)
-        
-    except Exception as e:
-        logger.error(f"Exception in batch_create_actors: {e}")
-        return f"❌ Error in batch create actors: {str(e)}"
+    failed_count = len(actor_rows) - created_count
+    
+    summary = f"Batch operation completed: {created_count} created, {failed_count} failed"
+    return f"{summary}\n\n" + "\n".join(results)
 
 @mcp.tool
+@_handle_tool_errors("Error listing nodes")
 def list_nodes(label: Optional[str] = None) -> str:
     """List nodes in the Neo4j database, optionally filtered by label."""
-    logger.info(f"List nodes tool called with label: {label}")
+    logger.info("List nodes tool called with label: %s", label)
     
-    try:
-        # Handle null/None values properly
-        if label is None or label == "null" or label == "":
-            query = "MATCH (n) RETURN n LIMIT 50"
-            parameters = {}
-        else:
-            query = f"MATCH (n:{label}) RETURN n LIMIT 50"
-            parameters = {}
-        
-        result = execute_neo4j_query(query, parameters)
+    # Handle null/None values properly
+    if label is None or label == "null" or label == "":
+        query = _LIST_NODES_QUERY
+    else:
+        query = f"MATCH (n:{_safe_ident(label)}) WITH n LIMIT $limit RETURN collect(n) AS nodes"
+    parameters = {"limit": 50}
+    
+    # The nodes come back collected into a single record rather than one record each
+    rows = execute_neo4j_query(query, parameters, cache_read=True, readonly=True)
+    nodes = rows[0]["nodes"] if rows else []
+    
+    if nodes:
+        node_count = len(nodes)
+        # Format the results for display
+        formatted_results = "\n\n".join(f"Node {i}:\n{format_neo4j_result({'n': node})}" for i, node in enumerate(nodes, 1))
         
-        # Check if we got a real result (not an error)
-        if result and len(result) > 0 and "error" not in result[0]:
-            node_count = len(result)
-            # Format the results for display
-            formatted_results = []
-            for i, record in enumerate(result, 1):
-                formatted_results.append(f"Node {i}:\n{format_neo4j_result(record)}")
-            
-            if label and label != "null" and label != "":
-                return f"✅ Found {node_count} nodes with label '{label}':\n\n" + "\n\n".join(formatted_results)
-            else:
-                return f"✅ Found {node_count} total nodes in database:\n\n" + "\n\n".join(formatted_results)
+        if label and label != "null" and label != "":
+            return f"✅ Found {node_count} nodes with label '{label}':\n\n" + formatted_results
         else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to list nodes: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in list_nodes: {e}")
-        return f"❌ Error listing nodes: {str(e)}"
+            return f"✅ Found {node_count} total nodes in database:\n\n" + formatted_results
+    else:
+        return "❌ Failed to list nodes: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error creating relationship")
 def create_relationship(from_node_id: str, to_node_id: str, relationship_type: str, properties: Optional[Dict[str, Any]] = None) -> str:
     """Create a relationship between two nodes."""
-    logger.info(f"Create relationship tool called: {from_node_id} -[{relationship_type}]-> {to_node_id}")
+    logger.info("Create relationship tool called: %s -[%s]-> %s", from_node_id, relationship_type, to_node_id)
     
     if not properties:
         properties = {}
     
-    try:
-        # Build Cypher query
-        property_string = ", ".join([f"{k}: ${k}" for k in properties.keys()])
-        
-        if property_string:
-            query = f"MATCH (a), (b) WHERE id(a) = {from_node_id} AND id(b) = {to_node_id} CREATE (a)-[r:{relationship_type} {{{property_string}}}]->(b) RETURN r"
-        else:
-            query = f"MATCH (a), (b) WHERE id(a) = {from_node_id} AND id(b) = {to_node_id} CREATE (a)-[r:{relationship_type}]->(b) RETURN r"
-        
-        result = execute_neo4j_query(query, properties)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Relationship created: {from_node_id} -[{relationship_type}]-> {to_node_id} with properties: {properties}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create relationship: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in create_relationship: {e}")
-        return f"❌ Error creating relationship: {str(e)}"
+    # Node ids and properties are bound as parameters; only the validated type is interpolated
+    rel_type = _safe_ident(relationship_type)
+    query = f"MATCH (a), (b) WHERE id(a) = $from_id AND id(b) = $to_id CREATE (a)-[r:{rel_type}]->(b) SET r = $props RETURN r"
+    parameters = {
+        "from_id": int(from_node_id),
+        "to_id": int(to_node_id),
+        "props": properties
+    }
+    
+    rows = execute_neo4j_query(query, parameters)
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Relationship created: {from_node_id} -[{relationship_type}]-> {to_node_id} with properties: {properties}"
+    else:
+        return "❌ Failed to create relationship: No result"
 
 @mcp.tool
+@_handle_tool_errors("Query execution error")
 def execute_query(query: str, parameters: Optional[Dict[str, Any]] = None) -> str:
     """Execute a Cypher query and return results."""
-    logger.info(f"Execute query tool called with query: {query}")
+    logger.info("Execute query tool called with query: %s", query)
     
-    try:
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            # Format the results for display
-            if len(result) == 1:
-                return f"✅ Query executed successfully:\n{format_neo4j_result(result[0])}"
-            else:
-                formatted_results = []
-                for i, record in enumerate(result, 1):
-                    formatted_results.append(f"Result {i}:\n{format_neo4j_result(record)}")
-                return f"✅ Query executed successfully ({len(result)} results):\n\n" + "\n\n".join(formatted_results)
+    read_only = _is_read_only_query(query)
+    # One row past the cap tells whether the output was cut
+    rows = execute_neo4j_query(query, parameters, limit=_MAX_RESULT_ROWS + 1, cache_read=read_only, readonly=read_only)
+    if not read_only:
+        _invalidate_read_cache()
+    truncated = len(rows) > _MAX_RESULT_ROWS
+    notice = _TRUNCATED_NOTICE if truncated else ""
+    
+    if rows:
+        # Format the results for display
+        if len(rows) == 1:
+            return f"✅ Query executed successfully:\n{format_neo4j_result(rows[0])}"
         else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Query failed: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in execute_query: {e}")
-        return f"❌ Query execution error: {str(e)}"
+            formatted_results = "\n\n".join(f"Result {i}:\n{format_neo4j_result(record)}" for i, record in enumerate(islice(rows, _MAX_RESULT_ROWS), 1))
+            return f"✅ Query executed successfully ({min(len(rows), _MAX_RESULT_ROWS)} results):\n\n" + formatted_results + notice
+    else:
+        return "❌ Query failed: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error getting nodes")
 def get_node(node_id: Optional[int] = None, labels: Optional[List[str]] = None, properties: Optional[Dict[str, Any]] = None) -> str:
     """Get nodes by criteria."""
-    logger.info(f"Get node tool called with node_id: {node_id}, labels: {labels}, properties: {properties}")
+    logger.info("Get node tool called with node_id: %s, labels: %s, properties: %s", node_id, labels, properties)
     
-    try:
-        # Build Cypher query based on criteria
-        if node_id is not None:
-            query = "MATCH (n) WHERE id(n) = $node_id RETURN n"
-            parameters = {"node_id": node_id}
-        elif labels:
-            label_string = ":".join(labels)
-            if properties:
-                # Build property conditions
-                prop_conditions = []
-                for key, value in properties.items():
-                    prop_conditions.append(f"n.{key} = ${key}")
-                conditions = " AND ".join(prop_conditions)
-                query = f"MATCH (n:{label_string}) WHERE {conditions} RETURN n"
-                parameters = properties
-            else:
-                query = f"MATCH (n:{label_string}) RETURN n"
-                parameters = {}
-        elif properties:
-            # Build property conditions
-            prop_conditions = []
-            for key, value in properties.items():
-                prop_conditions.append(f"n.{key} = ${key}")
-            conditions = " AND ".join(prop_conditions)
-            query = f"MATCH (n) WHERE {conditions} RETURN n"
-            parameters = properties
+    # Refuse an unfiltered full-graph scan
+    if node_id is None and not labels and not properties:
+        return "❌ Specify node_id, labels, or properties"
+    
+    # Build Cypher query based on criteria
+    if node_id is not None:
+        query = _GET_NODE_BY_ID_QUERY
+        parameters = {"node_id": node_id}
+    elif labels:
+        label_string = ":".join(_safe_ident(label) for label in labels)
+        if properties:
+            keys = tuple(sorted(properties))
+            fragment, names = _props_fragment(keys)
+            query = f"MATCH (n:{label_string} {{{fragment}}}) RETURN n"
+            parameters = {name: properties[key] for key, name in zip(keys, names)}
         else:
-            # Get all nodes
-            query = "MATCH (n) RETURN n LIMIT 100"
+            query = f"MATCH (n:{label_string}) RETURN n"
             parameters = {}
-        
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Retrieved {len(result)} nodes successfully"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to get nodes: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in get_node: {e}")
-        return f"❌ Error getting nodes: {str(e)}"
+    else:
+        keys = tuple(sorted(properties))
+        fragment, names = _props_fragment(keys)
+        query = f"MATCH (n {{{fragment}}}) RETURN n"
+        parameters = {name: properties[key] for key, name in zip(keys, names)}
+    
+    # Only the count is reported, so stream the rows instead of building a list;
+    # one row past the cap tells whether the count was cut
+    node_count = sum(1 for _ in execute_neo4j_query_iter(query, parameters, limit=_MAX_RESULT_ROWS + 1, readonly=True))
+    
+    if node_count > _MAX_RESULT_ROWS:
+        return f"✅ Retrieved {_MAX_RESULT_ROWS} nodes successfully{_TRUNCATED_NOTICE}"
+    if node_count:
+        return f"✅ Retrieved {node_count} nodes successfully"
+    else:
+        return "❌ Failed to get nodes: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error updating node")
 def update_node(node_id: int, properties: Optional[Dict[str, Any]] = None, labels: Optional[List[str]] = None) -> str:
     """Update a node by ID."""
-    logger.info(f"Update node tool called with node_id: {node_id}, properties: {properties}, labels: {labels}")
+    logger.info("Update node tool called with node_id: %s, properties: %s, labels: %s", node_id, properties, labels)
     
-    try:
-        # Build Cypher query
-        set_clauses = []
-        parameters = {"node_id": node_id}
-        
-        if properties:
-            for key, value in properties.items():
-                set_clauses.append(f"n.{key} = ${key}")
-                parameters[key] = value
-        
-        if labels:
-            # Remove existing labels and add new ones
-            set_clauses.append("n = n")
-            for label in labels:
-                set_clauses.append(f"SET n:{label}")
-        
-        if set_clauses:
-            query = f"MATCH (n) WHERE id(n) = $node_id SET {', '.join(set_clauses)} RETURN n"
-        else:
-            query = "MATCH (n) WHERE id(n) = $node_id RETURN n"
-        
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Node {node_id} updated successfully"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to update node: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in update_node: {e}")
-        return f"❌ Error updating node: {str(e)}"
+    # Build a single Cypher statement: merge properties, then add labels
+    query = "MATCH (n) WHERE id(n) = $node_id"
+    parameters = {"node_id": node_id}
+    
+    if properties:
+        query += " SET n += $props"
+        parameters["props"] = properties
+    
+    if labels:
+        labels_clause = "".join(f":{_safe_ident(label)}" for label in labels)
+        query += f" SET n{labels_clause}"
+    
+    query += " RETURN n"
+    
+    rows = execute_neo4j_query(query, parameters)
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Node {node_id} updated successfully"
+    else:
+        return "❌ Failed to update node: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error updating node")
 def update_node_by_property(label: str, property_name: str, property_value: str, new_properties: Dict[str, Any]) -> str:
     """Update a node by matching a specific property value."""
-    logger.info(f"Update node by property tool called with label: {label}, property: {property_name}={property_value}, new_properties: {new_properties}")
+    logger.info("Update node by property tool called with label: %s, property: %s=%s, new_properties: %s", label, property_name, property_value, new_properties)
     
-    try:
-        # Build Cypher query with proper parameter handling
-        set_clauses = []
-        parameters = {
-            "label": label,
-            "property_name": property_name,
-            "property_value": property_value
-        }
-        
-        for key, value in new_properties.items():
-            param_name = f"new_{key}"
-            set_clauses.append(f"n.{key} = ${param_name}")
-            parameters[param_name] = value
-        
-        if set_clauses:
-            query = f"""
-            MATCH (n:{label} {{{property_name}: $property_value}})
-            SET {', '.join(set_clauses)}
-            RETURN n
-            """
-        else:
-            query = f"""
-            MATCH (n:{label} {{{property_name}: $property_value}})
-            RETURN n
-            """
-        
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Node with {label}.{property_name}={property_value} updated successfully"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to update node: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in update_node_by_property: {e}")
-        return f"❌ Error updating node: {str(e)}"
+    # New properties are merged from one map parameter, so the query text ignores which keys change
+    query = f"""
+    MATCH (n:{_safe_ident(label)} {{{_safe_ident(property_name)}: $property_value}})
+    SET n += $new_properties
+    RETURN n
+    """
+    parameters = {
+        "property_value": property_value,
+        "new_properties": new_properties or {}
+    }
+    
+    rows = execute_neo4j_query(query, parameters)
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Node with {label}.{property_name}={property_value} updated successfully"
+    else:
+        return "❌ Failed to update node: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error adding property")
 def add_property_to_nodes(label: str, property_name: str, property_value: Any, filter_property: Optional[str] = None, filter_value: Optional[str] = None) -> str:
-    """Add a property to all nodes with a specific label, optionally filtered by another property."""
-    logger.info(f"Add property to nodes tool called with label: {label}, property: {property_name}={property_value}, filter: {filter_property}={filter_value}")
+    """Add a property to all nodes with a specific label, optionally filtered by another property.
     
-    try:
-        # Build Cypher query
-        if filter_property and filter_value:
-            # Add property to nodes matching filter
-            query = f"""
-            MATCH (n:{label} {{{filter_property}: $filter_value}})
-            SET n.{property_name} = $property_value
-            RETURN count(n) as updated_count
-            """
-            parameters = {
-                "filter_value": filter_value,
-                "property_value": property_value
-            }
-        else:
-            # Add property to all nodes with label
-            query = f"""
-            MATCH (n:{label})
-            SET n.{property_name} = $property_value
-            RETURN count(n) as updated_count
-            """
-            parameters = {
-                "property_value": property_value
-            }
-        
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            updated_count = result[0].get("updated_count", 0)
-            filter_info = f" matching {filter_property}={filter_value}" if filter_property and filter_value else ""
-            return f"✅ Added property {property_name}={property_value} to {updated_count} {label} nodes{filter_info}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to add property: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in add_property_to_nodes: {e}")
-        return f"❌ Error adding property: {str(e)}"
+    With APOC installed the update is committed in parallel batches, so it is not atomic: when a batch
+    fails, the batches already committed stay applied and the tool reports the failure.
+    """
+    logger.info("Add property to nodes tool called with label: %s, property: %s=%s, filter: %s=%s", label, property_name, property_value, filter_property, filter_value)
+    
+    # Build Cypher query
+    if filter_property and filter_value:
+        # Add property to nodes matching filter
+        match_query = f"MATCH (n:{_safe_ident(label)} {{{_safe_ident(filter_property)}: $filter_value}})"
+        parameters = {
+            "filter_value": filter_value,
+            "property_value": property_value
+        }
+    else:
+        # Add property to all nodes with label
+        match_query = f"MATCH (n:{_safe_ident(label)})"
+        parameters = {
+            "property_value": property_value
+        }
+    set_query = f"SET n.{_safe_ident(property_name)} = $property_value"
+    
+    if _apoc_available():
+        # Commit in batches on parallel workers instead of one large transaction
+        query = """
+        CALL apoc.periodic.iterate($match_query, $set_query, {batchSize: $batch_size, parallel: true, params: $params})
+        YIELD committedOperations, failedOperations, failedBatches, errorMessages
+        RETURN committedOperations as updated_count, failedOperations as failed_count, failedBatches as failed_batches, errorMessages as errors
+        """
+        parameters = {
+            "match_query": f"{match_query} RETURN n",
+            "set_query": set_query,
+            "batch_size": _APOC_BATCH_SIZE,
+            "params": parameters
+        }
+    else:
+        query = f"{match_query} {set_query} RETURN count(n) as updated_count, 0 as failed_count, 0 as failed_batches, {{}} as errors"
+    
+    rows = execute_neo4j_query(query, parameters)
+    
+    if rows:
+        # Committed batches stay applied even when others failed
+        _invalidate_read_cache()
+        result = rows[0]
+        updated_count = result["updated_count"]
+        filter_info = f" matching {filter_property}={filter_value}" if filter_property and filter_value else ""
+        if result["failed_count"] or result["failed_batches"]:
+            return (f"❌ Added property {property_name}={property_value} to only {updated_count} {label} nodes{filter_info}: "
+                    f"{result['failed_count']} updates failed in {result['failed_batches']} batches: {result['errors']}")
+        return f"✅ Added property {property_name}={property_value} to {updated_count} {label} nodes{filter_info}"
+    else:
+        return "❌ Failed to add property: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error adding property to node")
 def add_property_to_node_by_property(label: str, match_property: str, match_value: str, property_name: str, property_value: Any) -> str:
     """Add a property to a specific node by matching a property value."""
-    logger.info(f"Add property to node tool called with label: {label}, match: {match_property}={match_value}, property: {property_name}={property_value}")
+    logger.info("Add property to node tool called with label: %s, match: %s=%s, property: %s=%s", label, match_property, match_value, property_name, property_value)
     
-    try:
-        query = f"""
-        MATCH (n:{label} {{{match_property}: $match_value}})
-        SET n.{property_name} = $property_value
-        RETURN n
-        """
-        
-        parameters = {
-            "match_value": match_value,
-            "property_value": property_value
-        }
-        
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Added property {property_name}={property_value} to {label} with {match_property}='{match_value}'"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to add property to {label}: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in add_property_to_node_by_property: {e}")
-        return f"❌ Error adding property to {label}: {str(e)}"
+    query = f"""
+    MATCH (n:{_safe_ident(label)} {{{_safe_ident(match_property)}: $match_value}})
+    SET n.{_safe_ident(property_name)} = $property_value
+    RETURN n
+    """
+    
+    parameters = {
+        "match_value": match_value,
+        "property_value": property_value
+    }
+    
+    rows = execute_neo4j_query(query, parameters)
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Added property {property_name}={property_value} to {label} with {match_property}='{match_value}'"
+    else:
+        return f"❌ Failed to add property to {label}: No result"
 
 @mcp.tool
+@_handle_tool_errors("Error deleting node")
 def delete_node(node_id: int, cascade: bool = False) -> str:
     """Delete a node."""
-    logger.info(f"Delete node tool called with node_id: {node_id}, cascade: {cascade}")
+    logger.info("Delete node tool called with node_id: %s, cascade: %s", node_id, cascade)
     
-    try:
-        if cascade:
-            query = "MATCH (n) WHERE id(n) = $node_id DETACH DELETE n RETURN count(n) as deleted"
-        else:
-            query = "MATCH (n) WHERE id(n) = $node_id DELETE n RETURN count(n) as deleted"
-        
-        parameters = {"node_id": node_id}
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Node {node_id} deleted successfully"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to delete node: {error_msg}"
-    except Exception as e:
-        logger.error(f"Exception in delete_node: {e}")
-        return f"❌ Error deleting node: {str(e)}"
+    query = _DETACH_DELETE_NODE_QUERY if cascade else _DELETE_NODE_QUERY
+    
+    parameters = {"node_id": node_id}
+    rows = execute_neo4j_query(query, parameters, single_column="deleted")
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Node {node_id} deleted successfully"
+    else:
+        return "❌ Failed to delete node: No result"
 
 # ============================================================================
 # ADVANCED ANALYTICS FUNCTIONS
 # ============================================================================
 
 @mcp.tool
-def graph_analytics(analysis_type: str, node_label: Optional[str] = None, relationship_type: Optional[str] = None) -> str:
-    """Perform advanced graph analytics on the Neo4j database."""
-    logger.info(f"Graph analytics tool called with type: {analysis_type}, label: {node_label}, relationship: {relationship_type}")
+@_offload
+@_handle_tool_errors("Error performing graph analytics")
+def graph_analytics(analysis_type: str, node_label: Optional[str] = None, relationship_type: Optional[str] = None, sampling_size: int = 0, tolerance: float = 1e-3, source_node_id: Optional[int] = None) -> str:
+    """Perform advanced graph analytics on the Neo4j database.
     
-    try:
-        # First check if GDS is available
-        gds_check = execute_neo4j_query("CALL gds.list() YIELD name LIMIT 1")
-        gds_available = gds_check and len(gds_check) > 0 and "error" not in gds_check[0]
-        
-        if analysis_type == "degree_centrality":
-            if node_label:
-                query = f"""
-                MATCH (n:{node_label})
-                OPTIONAL MATCH (n)-[r]-()
-                RETURN n.name as node, size(collect(r)) as degree
-                ORDER BY degree DESC
-                LIMIT 10
-                """
-            else:
-                query = """
-                MATCH (n)
-                OPTIONAL MATCH (n)-[r]-()
-                RETURN labels(n)[0] as label, n.name as node, size(collect(r)) as degree
-                ORDER BY degree DESC
-                LIMIT 10
-                """
-        
-        elif analysis_type == "betweenness_centrality":
-            if gds_available:
-                # Use GDS betweenness centrality
-                query = """
-                CALL gds.betweenness.stream('myGraph')
-                YIELD nodeId, score
-                RETURN gds.util.asNode(nodeId).name as node, score as betweenness
-                ORDER BY score DESC
-                LIMIT 10
-                """
-            else:
-                # Fallback to APOC or native Cypher
-                query = """
-                MATCH (n)
-                OPTIONAL MATCH path = shortestPath((start)-[*]-(end))
-                WHERE start <> end AND n IN nodes(path)
-                RETURN n.name as node, count(path) as betweenness
-                ORDER BY betweenness DESC
-                LIMIT 10
-                """
-        
-        elif analysis_type == "community_detection":
-            if gds_available:
-                # Use GDS Louvain community detection
-                query = """
-                CALL gds.louvain.stream('myGraph')
-                YIELD nodeId, communityId
-                RETURN gds.util.asNode(nodeId).name as node, communityId
-                ORDER BY communityId
-                """
-            else:
-                # Fallback to native Cypher community detection based on connected components
-                query = """
-                MATCH (n)
-                WITH n, id(n) as nodeId
-                CALL apoc.algo.cover([n]) YIELD rel
-                WITH n, nodeId, collect(rel) as relationships
-                WITH n, nodeId, size(relationships) as component_size
-                RETURN n.name as node, nodeId % 10 as community_id, component_size
-                ORDER BY community_id, component_size DESC
-                LIMIT 20
-                """
-        
-        elif analysis_type == "pagerank":
-            if gds_available:
-                # Use GDS PageRank
-                query = """
-                CALL gds.pageRank.stream('myGraph')
-                YIELD nodeId, score
-                RETURN gds.util.asNode(nodeId).name as node, score
-                ORDER BY score DESC
-                LIMIT 10
-                """
-            else:
-                # Fallback to APOC PageRank
-                query = """
-                MATCH (n)
-                CALL apoc.algo.pageRank([n]) YIELD node, score
-                RETURN node.name as node, score
-                ORDER BY score DESC
-                LIMIT 10
-                """
-        
-        elif analysis_type == "node_similarity":
-            if gds_available:
-                # Use GDS Node Similarity
-                query = """
-                CALL gds.nodeSimilarity.stream('myGraph')
-                YIELD node1, node2, similarity
-                RETURN 
-                  gds.util.asNode(node1).name as node1,
-                  gds.util.asNode(node2).name as node2,
-                  similarity
-                ORDER BY similarity DESC
-                LIMIT 10
-                """
-            else:
-                # Fallback to native Cypher similarity based on common neighbors
-                query = """
-                MATCH (n1)-[:STARRED_IN]->(m:Movie)<-[:STARRED_IN]-(n2)
-                WHERE n1 <> n2
-                WITH n1, n2, count(m) as common_movies
-                WHERE common_movies > 0
-                RETURN n1.name as node1, n2.name as node2, common_movies as similarity
-                ORDER BY similarity DESC
-                LIMIT 10
-                """
-        
-        elif analysis_type == "path_analysis":
-            if relationship_type:
-                query = f"""
-                MATCH path = (start)-[:{relationship_type}*1..5]-(end)
-                WHERE start <> end
-                RETURN start.name as start_node, end.name as end_node, length(path) as path_length
-                ORDER BY path_length
-                LIMIT 10
-                """
-            else:
-                query = """
-                MATCH path = (start)-[*1..5]-(end)
-                WHERE start <> end
-                RETURN start.name as start_node, end.name as end_node, length(path) as path_length
-                ORDER BY path_length
-                LIMIT 10
-                """
-        
-        elif analysis_type == "clustering_coefficient":
-            if gds_available:
-                # Use GDS Local Clustering Coefficient
-                query = """
-                CALL gds.localClusteringCoefficient.stream('myGraph')
-                YIELD nodeId, localClusteringCoefficient
-                RETURN gds.util.asNode(nodeId).name as node, localClusteringCoefficient
-                ORDER BY localClusteringCoefficient DESC
-                LIMIT 10
-                """
-            else:
-                # Fallback to APOC clustering coefficient
-                query = """
-                MATCH (n)
-                CALL apoc.algo.triangleCount([n]) YIELD node, triangles
-                RETURN node.name as node, triangles as clustering_coefficient
-                ORDER BY triangles DESC
-                LIMIT 10
-                """
-        
+    sampling_size: source nodes sampled for betweenness_centrality; 0 means min(1024, node count).
+    tolerance: convergence threshold for pagerank and GDS community_detection (default 1e-3).
+    source_node_id: start node of path_analysis; omitted means a random start node.
+    """
+    logger.info("Graph analytics tool called with type: %s, label: %s, relationship: %s", analysis_type, node_label, relationship_type)
+    
+    # First check if GDS is available
+    gds_available = _gds_available()
+    parameters = {}
+    
+    if analysis_type == "degree_centrality":
+        # count{} on a bare pattern is answered from the node's degree counters; no list is built
+        if node_label:
+            query = f"""
+            MATCH (n:{_known_label(node_label)})
+            RETURN n.name as node, count{{ (n)--() }} as degree
+            ORDER BY degree DESC
+            LIMIT 10
+            """
         else:
-            available_types = "degree_centrality, betweenness_centrality, community_detection, pagerank, node_similarity, path_analysis, clustering_coefficient"
-            return f"❌ Unknown analysis type: {analysis_type}. Available types: {available_types}"
-        
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            # Format the results for display
-            formatted_results = []
-            for i, record in enumerate(result, 1):
-                formatted_results.append(f"Result {i}:\n{format_neo4j_result(record)}")
-            
-            algorithm_info = " (GDS)" if gds_available and analysis_type in ["betweenness_centrality", "community_detection", "pagerank", "node_similarity", "clustering_coefficient"] else " (Native/APOC)"
-            return f"✅ {analysis_type.replace('_', ' ').title()} Analysis Results{algorithm_info} ({len(result)} results):\n\n" + "\n\n".join(formatted_results)
+            query = """
+            MATCH (n) WHERE NOT n:`__Stats`
+            RETURN labels(n)[0] as label, n.name as node, count{ (n)--() } as degree
+            ORDER BY degree DESC
+            LIMIT 10
+            """
+    
+    elif analysis_type == "betweenness_centrality":
+        if gds_available:
+            # Use GDS betweenness centrality from a sample of source nodes
+            # (sampling_size 0 means min(1024, node count); only the top 10 ranks are reported)
+            query = """
+            CALL gds.graph.list('myGraph') YIELD nodeCount
+            WITH CASE WHEN $sampling_size > 0 THEN $sampling_size WHEN nodeCount < 1024 THEN nodeCount ELSE 1024 END as samplingSize
+            CALL gds.betweenness.stream('myGraph', {samplingSize: samplingSize, samplingSeed: 42})
+            YIELD nodeId, score
+            RETURN gds.util.asNode(nodeId).name as node, score as betweenness
+            ORDER BY score DESC
+            LIMIT 10
+            """
+            parameters = {"sampling_size": sampling_size}
         else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to perform {analysis_type} analysis: {error_msg}"
+            # APOC 4.x/5.x has no betweenness procedure, and an all-pairs shortestPath scan
+            # in plain Cypher does not finish on real graphs
+            return "❌ Betweenness centrality requires the Neo4j Graph Data Science library. Please install GDS library first."
     
-    except Exception as e:
-        logger.error(f"Exception in graph_analytics: {e}")
-        return f"❌ Error performing graph analytics: {str(e)}"
+    elif analysis_type == "community_detection":
+        if gds_available:
+            # Use GDS Louvain community detection
+            query = """
+            CALL gds.louvain.stream('myGraph', {tolerance: $tolerance})
+            YIELD nodeId, communityId
+            RETURN gds.util.asNode(nodeId).name as node, communityId
+            ORDER BY communityId
+            """
+            parameters = {"tolerance": tolerance}
+        else:
+            # Fallback to native Cypher community detection based on connected components
+            query = """
+            MATCH (n)
+            WITH n, id(n) as nodeId
+            CALL apoc.algo.cover([n]) YIELD rel
+            WITH n, nodeId, collect(rel) as relationships
+            WITH n, nodeId, size(relationships) as component_size
+            RETURN n.name as node, nodeId % 10 as community_id, component_size
+            ORDER BY community_id, component_size DESC
+            LIMIT 20
+            """
+    
+    elif analysis_type == "pagerank":
+        if gds_available:
+            # Use GDS PageRank, stopping once scores move less than the tolerance
+            query = """
+            CALL gds.pageRank.stream('myGraph', {maxIterations: 50, tolerance: $tolerance, dampingFactor: 0.85, scaler: 'L1NORM'})
+            YIELD nodeId, score
+            RETURN gds.util.asNode(nodeId).name as node, score
+            ORDER BY score DESC
+            LIMIT 10
+            """
+            parameters = {"tolerance": tolerance}
+        elif np is not None:
+            # Computed in-process from a CSR copy of the graph (see _csr_pagerank_rows)
+            query = None
+        else:
+            # Fallback to APOC PageRank
+            query = """
+            MATCH (n)
+            CALL apoc.algo.pageRank([n]) YIELD node, score
+            RETURN node.name as node, score
+            ORDER BY score DESC
+            LIMIT 10
+            """
+    
+    elif analysis_type == "node_similarity":
+        if gds_available:
+            # Use GDS Node Similarity
+            query = """
+            CALL gds.nodeSimilarity.stream('myGraph')
+            YIELD node1, node2, similarity
+            RETURN 
+              gds.util.asNode(node1).name as node1,
+              gds.util.asNode(node2).name as node2,
+              similarity
+            ORDER BY similarity DESC
+            LIMIT 10
+            """
+        else:
+            # Fallback to native Cypher similarity based on common neighbors
+            query = """
+            MATCH (n1)-[:STARRED_IN]->(m:Movie)<-[:STARRED_IN]-(n2)
+            WHERE n1 <> n2
+            WITH n1, n2, count(m) as common_movies
+            WHERE common_movies > 0
+            RETURN n1.name as node1, n2.name as node2, common_movies as similarity
+            ORDER BY similarity DESC
+            LIMIT 10
+            """
+    
+    elif analysis_type == "path_analysis":
+        # Shortest paths out of one start node (the given one, or one picked at random)
+        # rather than enumerating paths between every pair of nodes
+        if source_node_id is not None:
+            start_clause = "MATCH (start) WHERE id(start) = $source_node_id"
+        elif gds_available:
+            # A random start must be part of the projection, or Dijkstra rejects it
+            start_clause = """
+            CALL gds.graph.list('myGraph') YIELD nodeProjection
+            WITH keys(nodeProjection) as projected
+            MATCH (start) WHERE '__ALL__' IN projected OR any(label IN labels(start) WHERE label IN projected)
+            WITH start ORDER BY rand() LIMIT 1
+            """
+        else:
+            start_clause = "MATCH (start) WHERE NOT start:`__Stats` WITH start ORDER BY rand() LIMIT 1"
+        parameters = {"source_node_id": source_node_id}
+        if gds_available:
+            query = start_clause + """
+            CALL gds.allShortestPaths.dijkstra.stream('myGraph', {sourceNode: start, relationshipTypes: $relationship_types})
+            YIELD targetNode, totalCost
+            WITH start, targetNode, totalCost WHERE targetNode <> id(start)
+            RETURN start.name as start_node, gds.util.asNode(targetNode).name as end_node, totalCost as path_length
+            ORDER BY path_length
+            LIMIT 10
+            """
+            parameters["relationship_types"] = [relationship_type] if relationship_type else ["*"]
+        elif _apoc_available():
+            # Breadth-first spanning tree: one shortest path per reachable node
+            query = start_clause + """
+            CALL apoc.path.spanningTree(start, {maxLevel: 5, relationshipFilter: $relationship_filter})
+            YIELD path
+            WITH start, path WHERE length(path) > 0
+            RETURN start.name as start_node, last(nodes(path)).name as end_node, length(path) as path_length
+            ORDER BY path_length
+            LIMIT 10
+            """
+            parameters["relationship_filter"] = relationship_type or ""
+        else:
+            rel_pattern = f":{_known_rel_type(relationship_type)}" if relationship_type else ""
+            query = start_clause + f"""
+            MATCH path = (start)-[{rel_pattern}*1..5]-(end)
+            WHERE start <> end
+            RETURN start.name as start_node, end.name as end_node, length(path) as path_length
+            ORDER BY path_length
+            LIMIT 10
+            """
+    
+    elif analysis_type == "clustering_coefficient":
+        if gds_available:
+            # Use GDS Local Clustering Coefficient
+            query = """
+            CALL gds.localClusteringCoefficient.stream('myGraph')
+            YIELD nodeId, localClusteringCoefficient
+            RETURN gds.util.asNode(nodeId).name as node, localClusteringCoefficient
+            ORDER BY localClusteringCoefficient DESC
+            LIMIT 10
+            """
+        else:
+            # Fallback to APOC clustering coefficient
+            query = """
+            MATCH (n)
+            CALL apoc.algo.triangleCount([n]) YIELD node, triangles
+            RETURN node.name as node, triangles as clustering_coefficient
+            ORDER BY triangles DESC
+            LIMIT 10
+            """
+    
+    else:
+        available_types = "degree_centrality, betweenness_centrality, community_detection, pagerank, node_similarity, path_analysis, clustering_coefficient"
+        return f"❌ Unknown analysis type: {analysis_type}. Available types: {available_types}"
+    
+    if query is None:
+        rows = _csr_pagerank_rows(tolerance)
+    elif _MATERIALIZED_STATS and analysis_type == "degree_centrality":
+        rows = _materialized_rows(f"degree_centrality:{node_label or '*'}", query, parameters)
+    else:
+        # Analytics only read the graph (or a projection), so repeated runs are served from the read cache;
+        # a randomly picked path_analysis start must not be replayed from it
+        random_start = analysis_type == "path_analysis" and source_node_id is None
+        rows = execute_neo4j_query(query, parameters, cache_read=not random_start, readonly=True)
+    
+    if rows:
+        # Format the results for display
+        # Every row of an analysis has the same scalar columns, so the row layout is resolved once
+        template = _scalar_row_template(tuple(rows[0]))
+        formatted_results = "\n\n".join(f"Result {i}:\n{template.format(*record.values())}" for i, record in enumerate(rows, 1))
+        
+        if query is None:
+            algorithm_info = " (in-process NumPy)"
+        elif gds_available and analysis_type in ["betweenness_centrality", "community_detection", "pagerank", "node_similarity", "clustering_coefficient"]:
+            algorithm_info = " (GDS)"
+        else:
+            algorithm_info = " (Native/APOC)"
+        return f"✅ {analysis_type.replace('_', ' ').title()} Analysis Results{algorithm_info} ({len(rows)} results):\n\n" + formatted_results
+    else:
+        return f"❌ Failed to perform {analysis_type} analysis: No result"
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error creating graph projection")
 def create_graph_projection(graph_name: str = "myGraph", node_labels: Optional[List[str]] = None, relationship_types: Optional[List[str]] = None) -> str:
     """Create a graph projection for GDS algorithms."""
-    logger.info(f"Create graph projection tool called with name: {graph_name}, nodes: {node_labels}, relationships: {relationship_types}")
+    logger.info("Create graph projection tool called with name: %s, nodes: %s, relationships: %s", graph_name, node_labels, relationship_types)
+    
+    # Check if GDS is available
+    gds_available = _gds_available()
+    
+    if not gds_available:
+        return "❌ Neo4j Graph Data Science library not available. Please install GDS library first."
+    
+    # Set defaults if not provided
+    if not node_labels:
+        node_labels = ["Movie", "Actor"]
+    if not relationship_types:
+        relationship_types = ["STARRED_IN"]
+    
+    # Create the graph projection
+    query = "CALL gds.graph.project($graph_name, $node_labels, $relationship_types)"
+    parameters = {
+        "graph_name": graph_name,
+        "node_labels": node_labels,
+        "relationship_types": relationship_types
+    }
     
     try:
-        # Check if GDS is available
-        gds_check = execute_neo4j_query("CALL gds.list() YIELD name LIMIT 1")
-        gds_available = gds_check and len(gds_check) > 0 and "error" not in gds_check[0]
-        
-        if not gds_available:
-            return "❌ Neo4j Graph Data Science library not available. Please install GDS library first."
-        
-        # Set defaults if not provided
-        if not node_labels:
-            node_labels = ["Movie", "Actor"]
-        if not relationship_types:
-            relationship_types = ["STARRED_IN"]
-        
-        # Create the graph projection
-        node_labels_str = "['" + "', '".join(node_labels) + "']"
-        relationship_types_str = "['" + "', '".join(relationship_types) + "']"
-        
-        query = f"""
-        CALL gds.graph.project(
-          '{graph_name}',
-          {node_labels_str},
-          {relationship_types_str}
-        )
-        """
-        
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Graph projection '{graph_name}' created successfully with nodes: {node_labels}, relationships: {relationship_types}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create graph projection: {error_msg}"
+        rows = execute_neo4j_query(query, parameters)
+    except Neo4jQueryError:
+        # GDS may have been removed or restarted since it was last probed
+        invalidate_gds_cache()
+        raise
     
-    except Exception as e:
-        logger.error(f"Exception in create_graph_projection: {e}")
-        return f"❌ Error creating graph projection: {str(e)}"
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Graph projection '{graph_name}' created successfully with nodes: {node_labels}, relationships: {relationship_types}"
+    else:
+        return "❌ Failed to create graph projection: No result"
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error listing graph projections")
 def list_graph_projections() -> str:
     """List all available graph projections."""
     logger.info("List graph projections tool called")
     
-    try:
-        # Check if GDS is available
-        gds_check = execute_neo4j_query("CALL gds.list() YIELD name LIMIT 1")
-        gds_available = gds_check and len(gds_check) > 0 and "error" not in gds_check[0]
-        
-        if not gds_available:
-            return "❌ Neo4j Graph Data Science library not available. Please install GDS library first."
-        
-        query = "CALL gds.graph.list() YIELD graphName, nodeCount, relationshipCount, nodeProjection, relationshipProjection"
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            formatted_results = []
-            for i, record in enumerate(result, 1):
-                formatted_results.append(f"Projection {i}:\n{format_neo4j_result(record)}")
-            
-            return f"✅ Graph Projections ({len(result)} projections):\n\n" + "\n\n".join(formatted_results)
-        else:
-            return "✅ No graph projections found. Use create_graph_projection to create one."
+    # Check if GDS is available
+    gds_available = _gds_available()
     
-    except Exception as e:
-        logger.error(f"Exception in list_graph_projections: {e}")
-        return f"❌ Error listing graph projections: {str(e)}"
+    if not gds_available:
+        return "❌ Neo4j Graph Data Science library not available. Please install GDS library first."
+    
+    query = "CALL gds.graph.list() YIELD graphName, nodeCount, relationshipCount, nodeProjection, relationshipProjection"
+    rows = execute_neo4j_query(query, cache_read=True, readonly=True)
+    
+    if rows:
+        formatted_results = "\n\n".join(f"Projection {i}:\n{format_neo4j_result(record)}" for i, record in enumerate(rows, 1))
+        
+        return f"✅ Graph Projections ({len(rows)} projections):\n\n" + formatted_results
+    else:
+        return "✅ No graph projections found. Use create_graph_projection to create one."
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error dropping graph projection")
 def drop_graph_projection(graph_name: str) -> str:
     """Drop a graph projection."""
-    logger.info(f"Drop graph projection tool called with name: {graph_name}")
+    logger.info("Drop graph projection tool called with name: %s", graph_name)
     
-    try:
-        # Check if GDS is available
-        gds_check = execute_neo4j_query("CALL gds.list() YIELD name LIMIT 1")
-        gds_available = gds_check and len(gds_check) > 0 and "error" not in gds_check[0]
-        
-        if not gds_available:
-            return "❌ Neo4j Graph Data Science library not available. Please install GDS library first."
-        
-        query = f"CALL gds.graph.drop('{graph_name}')"
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Graph projection '{graph_name}' dropped successfully"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to drop graph projection: {error_msg}"
+    # Check if GDS is available
+    gds_available = _gds_available()
     
-    except Exception as e:
-        logger.error(f"Exception in drop_graph_projection: {e}")
-        return f"❌ Error dropping graph projection: {str(e)}"
+    if not gds_available:
+        return "❌ Neo4j Graph Data Science library not available. Please install GDS library first."
+    
+    query = "CALL gds.graph.drop($graph_name)"
+    rows = execute_neo4j_query(query, {"graph_name": graph_name})
+    
+    if rows:
+        _invalidate_read_cache()
+        return f"✅ Graph projection '{graph_name}' dropped successfully"
+    else:
+        return "❌ Failed to drop graph projection: No result"
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error getting graph statistics")
 def graph_statistics() -> str:
     """Get comprehensive statistics about the graph database."""
     logger.info("Graph statistics tool called")
     
-    try:
-        queries = {
-            "node_count": "MATCH (n) RETURN count(n) as total_nodes",
-            "relationship_count": "MATCH ()-[r]->() RETURN count(r) as total_relationships",
-            "node_labels": "MATCH (n) RETURN labels(n) as labels, count(n) as count ORDER BY count DESC",
-            "relationship_types": "MATCH ()-[r]->() RETURN type(r) as type, count(r) as count ORDER BY count DESC",
-            "avg_degree": "MATCH (n) OPTIONAL MATCH (n)-[r]-() RETURN avg(size(collect(r))) as avg_degree",
-            "density": """
-            MATCH (n)
-            MATCH ()-[r]->()
-            RETURN toFloat(count(r)) / (count(n) * (count(n) - 1)) as density
-            """
+    if _apoc_available():
+        # Store-level counters: constant time regardless of graph size
+        query = """
+        CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount
+        RETURN nodeCount - coalesce(labels['__Stats'], 0) as total_nodes, relCount as total_relationships,
+               [label IN keys(labels) WHERE label <> '__Stats' | {labels: [label], count: labels[label]}] as node_labels,
+               [type IN keys(relTypesCount) | {type: type, count: relTypesCount[type]}] as relationship_types
+        """
+    else:
+        # One round-trip: each statistic is an independent subquery
+        # (the node total is two count-store lookups, leaving out the materialized-stats nodes)
+        query = """
+        CALL { MATCH (n) RETURN count(n) as all_nodes }
+        CALL { MATCH (s:`__Stats`) RETURN count(s) as stats_nodes }
+        CALL { MATCH ()-[r]->() RETURN count(r) as total_relationships }
+        CALL {
+            MATCH (n) WHERE NOT n:`__Stats` WITH labels(n) as labels, count(n) as count
+            RETURN collect({labels: labels, count: count}) as node_labels
         }
-        
-        results = {}
-        for stat_name, query in queries.items():
-            result = execute_neo4j_query(query)
-            if result and len(result) > 0 and "error" not in result[0]:
-                results[stat_name] = result[0]
-            else:
-                results[stat_name] = {"error": "Failed to compute"}
-        
-        # Format the statistics
-        formatted_stats = []
-        for stat_name, result in results.items():
-            if "error" not in result:
-                formatted_stats.append(f"{stat_name.replace('_', ' ').title()}: {format_neo4j_result(result)}")
+        CALL {
+            MATCH ()-[r]->() WITH type(r) as type, count(r) as count
+            RETURN collect({type: type, count: count}) as relationship_types
+        }
+        RETURN all_nodes - stats_nodes as total_nodes, total_relationships, node_labels, relationship_types
+        """
+    
+    with _READ_CACHE_LOCK:
+        rows = _STATS_CACHE.get(query)
+    if rows is None:
+        try:
+            if _MATERIALIZED_STATS:
+                rows = _materialized_rows("graph_statistics", query)
             else:
-                formatted_stats.append(f"{stat_name.replace('_', ' ').title()}: {result['error']}")
-        
-        return f"✅ Graph Statistics:\n\n" + "\n".join(formatted_stats)
+                rows = execute_neo4j_query(query, readonly=True)
+        except Neo4jQueryError as e:
+            logger.warning("Could not read graph statistics: %s", e)
+            rows = []
+        else:
+            with _READ_CACHE_LOCK:
+                _STATS_CACHE[query] = rows
     
-    except Exception as e:
-        logger.error(f"Exception in graph_statistics: {e}")
-        return f"❌ Error getting graph statistics: {str(e)}"
+    # Average degree and density follow from the two counts; no extra scan needed
+    results = dict.fromkeys(["node_count", "relationship_count", "node_labels", "relationship_types", "avg_degree", "density"])
+    if rows:
+        stats = rows[0]
+        nodes, rels = stats["total_nodes"], stats["total_relationships"]
+        results["node_count"] = {"total_nodes": nodes}
+        results["relationship_count"] = {"total_relationships": rels}
+        if stats["node_labels"]:
+            results["node_labels"] = max(stats["node_labels"], key=lambda entry: entry["count"])
+        if stats["relationship_types"]:
+            results["relationship_types"] = max(stats["relationship_types"], key=lambda entry: entry["count"])
+        results["avg_degree"] = {"avg_degree": 2.0 * rels / nodes if nodes else 0.0}
+        results["density"] = {"density": rels / (nodes * (nodes - 1)) if nodes > 1 else 0.0}
+    
+    # Format the statistics
+    formatted_stats = []
+    for stat_name, record in results.items():
+        if record is not None:
+            formatted_stats.append(f"{stat_name.replace('_', ' ').title()}: {_scalar_row_template(tuple(record)).format(*record.values())}")
+        else:
+            formatted_stats.append(f"{stat_name.replace('_', ' ').title()}: Failed to compute")
+    
+    return f"✅ Graph Statistics:\n\n" + "\n".join(formatted_stats)
 
 # ============================================================================
 # RAG (RETRIEVAL-AUGMENTED GENERATION) FUNCTIONS
 # ============================================================================
 
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+_LUCENE_OPERATOR_RE = re.compile(r"\b(AND|OR|NOT)\b")
+
+def _escape_lucene(text: str) -> str:
+    """Escape Lucene query syntax, including the AND/OR/NOT operators, so free text is matched literally."""
+    return _LUCENE_OPERATOR_RE.sub(r"\\\1", _LUCENE_SPECIAL_RE.sub(r"\\\1", text))
+
+def _fulltext_index_name(label: str, properties: List[str]) -> str:
+    """Conventional name of the full-text index over label/properties; property order does not matter."""
+    return f"ft_{_safe_ident(label)}_{'_'.join(_safe_ident(prop) for prop in sorted(properties))}"
+
+def _missing_fulltext_index(error: Exception, label: str, properties: List[str]) -> Optional[str]:
+    """The tool message for a query that failed because its full-text index does not exist, else None."""
+    if _fulltext_index_name(label, properties) not in str(error):
+        return None
+    return f"❌ No full-text index for {label}{sorted(properties)}. Create it first with ensure_fulltext_index(node_label='{label}', properties={sorted(properties)})"
+
 @mcp.tool
-def create_vector_index(index_name: str, node_label: str, property_name: str, dimensions: int = 1536) -> str:
-    """Create a vector index for RAG operations."""
-    logger.info(f"Create vector index tool called with name: {index_name}, label: {node_label}, property: {property_name}")
+@_offload
+@_handle_tool_errors("Error creating full-text index")
+def ensure_fulltext_index(node_label: str, properties: List[str]) -> str:
+    """Create the full-text index that hybrid_search and rag_context_retrieval use for label/properties, and wait until it is online."""
+    logger.info("Ensure full-text index tool called with label: %s, properties: %s", node_label, properties)
     
-    try:
-        # Check if Neo4j Graph Data Science library is available
-        check_query = "CALL dbms.procedures() YIELD name WHERE name CONTAINS 'gds' RETURN count(name) as gds_available"
-        check_result = execute_neo4j_query(check_query)
-        
-        if not check_result or "error" in check_result[0] or check_result[0].get("gds_available", 0) == 0:
-            return "❌ Neo4j Graph Data Science library not available. Please install GDS library for vector operations."
-        
-        # Create vector index
-        query = f"""
-        CALL db.index.vector.createNodeIndex(
-            '{index_name}',
-            '{node_label}',
-            '{property_name}',
-            {dimensions},
-            'cosine'
-        )
-        """
-        
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Vector index '{index_name}' created successfully for {node_label}.{property_name}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create vector index: {error_msg}"
+    if not properties:
+        return "❌ Specify at least one property"
     
-    except Exception as e:
-        logger.error(f"Exception in create_vector_index: {e}")
-        return f"❌ Error creating vector index: {str(e)}"
+    name = _fulltext_index_name(node_label, properties)
+    on_each = ", ".join(f"n.{_safe_ident(prop)}" for prop in sorted(properties))
+    execute_neo4j_query(
+        f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (n:{_safe_ident(node_label)}) ON EACH [{on_each}]"
+    )
+    execute_neo4j_query("CALL db.awaitIndex($name)", {"name": name})
+    return f"✅ Full-text index '{name}' is online for {node_label}{sorted(properties)}"
+
+@mcp.tool
+@_offload
+@_handle_tool_errors("Error creating vector index")
+def create_vector_index(index_name: str, node_label: str, property_name: str, dimensions: int = 1536, quantization: bool = False) -> str:
+    """Create a vector index for RAG operations; quantization=True needs Neo4j 5.23 or later."""
+    logger.info("Create vector index tool called with name: %s, label: %s, property: %s", index_name, node_label, property_name)
+    
+    # Vector indexes are part of Neo4j itself; with quantization (Neo4j 5.23+) the index keeps
+    # int8 copies of the vectors, roughly a quarter of the memory of the float vectors
+    index_config = f"`vector.dimensions`: {int(dimensions)}, `vector.similarity_function`: 'cosine'"
+    if quantization:
+        index_config += ", `vector.quantization.enabled`: true"
+    query = (
+        f"CREATE VECTOR INDEX {_safe_ident(index_name)} IF NOT EXISTS "
+        f"FOR (n:{_safe_ident(node_label)}) ON (n.{_safe_ident(property_name)}) "
+        f"OPTIONS {{indexConfig: {{{index_config}}}}}"
+    )
+    
+    # Schema commands return no rows; reaching here without an error means the index exists
+    execute_neo4j_query(query)
+    _invalidate_read_cache()
+    return f"✅ Vector index '{index_name}' created successfully for {node_label}.{property_name}"
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error performing semantic search")
 def semantic_search(query_vector: List[float], index_name: str, limit: int = 5) -> str:
     """Perform semantic search using vector similarity."""
-    logger.info(f"Semantic search tool called with index: {index_name}, limit: {limit}")
+    logger.info("Semantic search tool called with index: %s, limit: %s", index_name, limit)
     
-    try:
-        # Convert query vector to string format for Cypher
-        vector_str = "[" + ", ".join(map(str, query_vector)) + "]"
-        
-        query = f"""
-        CALL db.index.vector.queryNodes('{index_name}', {limit}, {vector_str})
-        YIELD node, score
-        RETURN node.name as name, node.description as description, score
-        ORDER BY score DESC
-        """
-        
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            # Format the results for display
-            formatted_results = []
-            for i, record in enumerate(result, 1):
-                formatted_results.append(f"Result {i}:\n{format_neo4j_result(record)}")
-            
-            return f"✅ Semantic Search Results ({len(result)} results):\n\n" + "\n\n".join(formatted_results)
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to perform semantic search: {error_msg}"
+    # The vector is sent as a Bolt list parameter, so the query text never changes
+    query = """
+    CALL db.index.vector.queryNodes($index_name, $limit, $query_vector)
+    YIELD node, score
+    RETURN node.name as name, node.description as description, score
+    ORDER BY score DESC
+    """
+    parameters = {
+        "index_name": index_name,
+        "limit": limit,
+        "query_vector": query_vector
+    }
     
-    except Exception as e:
-        logger.error(f"Exception in semantic_search: {e}")
-        return f"❌ Error performing semantic search: {str(e)}"
+    # Format each record as it streams off the cursor rather than collecting the rows first
+    formatted_results = [f"Result {i}:\n{format_neo4j_result(record)}" for i, record in enumerate(execute_neo4j_query_iter(query, parameters, limit=limit, readonly=True), 1)]
+    
+    if formatted_results:
+        return f"✅ Semantic Search Results ({len(formatted_results)} results):\n\n" + "\n\n".join(formatted_results)
+    else:
+        return "❌ Failed to perform semantic search: No result"
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error performing hybrid search")
 def hybrid_search(text_query: str, node_label: str, vector_property: str, text_properties: List[str], limit: int = 5) -> str:
     """Perform hybrid search combining text and vector similarity."""
-    logger.info(f"Hybrid search tool called with query: {text_query}, label: {node_label}")
+    logger.info("Hybrid search tool called with query: %s, label: %s", text_query, node_label)
     
-    try:
-        # Build text search conditions
-        text_conditions = []
-        for prop in text_properties:
-            text_conditions.append(f"n.{prop} CONTAINS '{text_query}'")
-        
-        text_condition = " OR ".join(text_conditions) if text_conditions else "1=1"
-        
+    # Unknown labels are rejected before any query is planned
+    node_label = _known_label(node_label)
+    
+    parameters = {"vector_property": vector_property, "limit": limit}
+    if text_properties:
+        # Lucene full-text lookup instead of a CONTAINS scan over every node of the label
+        query = """
+        CALL db.index.fulltext.queryNodes($index_name, $text_query) YIELD node, score
+        RETURN node.name as name, size(node[$vector_property]) as vector_dims, node.description as description, score
+        ORDER BY score DESC
+        LIMIT $limit
+        """
+        parameters["index_name"] = _fulltext_index_name(node_label, text_properties)
+        parameters["text_query"] = _escape_lucene(text_query)
+    else:
         query = f"""
-        MATCH (n:{node_label})
-        WHERE {text_condition}
-        RETURN n.name as name, n.{vector_property} as vector, n.description as description
-        ORDER BY n.name
-        LIMIT {limit}
+        MATCH (n:{_safe_ident(node_label)})
+        RETURN n.name as name, size(n[$vector_property]) as vector_dims, n.description as description
+        LIMIT $limit
         """
-        
-        result = execute_neo4j_query(query)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            # Format the results for display
-            formatted_results = []
-            for i, record in enumerate(result, 1):
-                # Remove vector from display for readability
-                if "vector" in record:
-                    record["vector"] = f"[{len(record['vector'])} dimensions]"
-                formatted_results.append(f"Result {i}:\n{format_neo4j_result(record)}")
-            
-            return f"✅ Hybrid Search Results ({len(result)} results):\n\n" + "\n\n".join(formatted_results)
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to perform hybrid search: {error_msg}"
     
-    except Exception as e:
-        logger.error(f"Exception in hybrid_search: {e}")
-        return f"❌ Error performing hybrid search: {str(e)}"
+    # Format each record as it streams off the cursor rather than collecting the rows first
+    try:
+        formatted_results = [f"Result {i}:\n{format_neo4j_result(record)}" for i, record in enumerate(execute_neo4j_query_iter(query, parameters, limit=limit, readonly=True), 1)]
+    except Neo4jQueryError as e:
+        missing = text_properties and _missing_fulltext_index(e, node_label, text_properties)
+        if missing:
+            return missing
+        raise
+    
+    if formatted_results:
+        return f"✅ Hybrid Search Results ({len(formatted_results)} results):\n\n" + "\n\n".join(formatted_results)
+    else:
+        return "❌ Failed to perform hybrid search: No result"
+
+def _create_embedding_nodes(node_label: str, rows: List[Dict[str, Any]]) -> int:
+    """Create one node per row in a single UNWIND round-trip and return how many were created."""
+    # Only the validated label is spliced in; every row's properties travel as a parameter
+    query = f"UNWIND $rows AS row CREATE (n:{_safe_ident(node_label)}) SET n += row RETURN count(n) AS created"
+    created = execute_neo4j_query(query, {"rows": rows}, single_column="created")
+    if created and created[0]:
+        _invalidate_read_cache()
+        return created[0]
+    return 0
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error creating embedding node")
 def create_embedding_node(node_label: str, name: str, description: str, embedding: List[float]) -> str:
     """Create a node with embedding for RAG operations."""
-    logger.info(f"Create embedding node tool called with label: {node_label}, name: {name}")
+    logger.info("Create embedding node tool called with label: %s, name: %s", node_label, name)
     
-    try:
-        # Convert embedding to string format for Cypher
-        embedding_str = "[" + ", ".join(map(str, embedding)) + "]"
-        
-        query = f"""
-        CREATE (n:{node_label} {{
-            name: $name,
-            description: $description,
-            embedding: $embedding
-        }})
-        RETURN n
-        """
-        
-        parameters = {
-            "name": name,
-            "description": description,
-            "embedding": embedding
-        }
-        
-        result = execute_neo4j_query(query, parameters)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            return f"✅ Embedding node created successfully: {name}"
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to create embedding node: {error_msg}"
+    created = _create_embedding_nodes(node_label, [{"name": name, "description": description, "embedding": embedding}])
     
-    except Exception as e:
-        logger.error(f"Exception in create_embedding_node: {e}")
-        return f"❌ Error creating embedding node: {str(e)}"
+    if created:
+        return f"✅ Embedding node created successfully: {name}"
+    else:
+        return "❌ Failed to create embedding node: No result"
 
 @mcp.tool
+@_offload
+@_handle_tool_errors("Error creating embedding nodes")
+def create_embedding_nodes(node_label: str, rows: List[Dict[str, Any]]) -> str:
+    """Create many nodes with embeddings for RAG operations in one batch."""
+    logger.info("Create embedding nodes tool called with label: %s, %s rows", node_label, len(rows))
+    
+    if not rows:
+        return "❌ Specify at least one row"
+    
+    created = _create_embedding_nodes(node_label, rows)
+    
+    if created:
+        return f"✅ Created {created} embedding nodes with label {node_label}"
+    else:
+        return "❌ Failed to create embedding nodes: No result"
+
+@mcp.tool
+@_offload
+@_handle_tool_errors("Error retrieving RAG context")
 def rag_context_retrieval(query: str, node_label: str, context_properties: List[str], limit: int = 3) -> str:
     """Retrieve relevant context for RAG operations based on text similarity."""
-    logger.info(f"RAG context retrieval tool called with query: {query}, label: {node_label}")
+    logger.info("RAG context retrieval tool called with query: %s, label: %s", query, node_label)
     
-    try:
-        # Build context search conditions
-        context_conditions = []
-        for prop in context_properties:
-            context_conditions.append(f"n.{prop} CONTAINS '{query}'")
-        
-        context_condition = " OR ".join(context_conditions) if context_conditions else "1=1"
-        
-        # Build return properties
-        return_props = ", ".join([f"n.{prop} as {prop}" for prop in context_properties])
-        
-        query_cypher = f"""
-        MATCH (n:{node_label})
-        WHERE {context_condition}
-        RETURN {return_props}
-        ORDER BY n.name
-        LIMIT {limit}
+    # Unknown labels are rejected before any query is planned
+    node_label = _known_label(node_label)
+    
+    parameters = {"props": context_properties, "limit": limit}
+    if context_properties:
+        # Lucene full-text lookup ranked by relevance; the requested properties come back as one list per node
+        query_cypher = """
+        CALL db.index.fulltext.queryNodes($index_name, $query) YIELD node, score
+        RETURN [prop IN $props | node[prop]] as context
+        ORDER BY score DESC
+        LIMIT $limit
         """
-        
-        result = execute_neo4j_query(query_cypher)
-        
-        if result and len(result) > 0 and "error" not in result[0]:
-            # Format the results for display
-            formatted_results = []
-            for i, record in enumerate(result, 1):
-                formatted_results.append(f"Context {i}:\n{format_neo4j_result(record)}")
-            
-            return f"✅ RAG Context Retrieved ({len(result)} contexts):\n\n" + "\n\n".join(formatted_results)
-        else:
-            error_msg = result[0].get("error", "Unknown error") if result else "No result"
-            return f"❌ Failed to retrieve RAG context: {error_msg}"
+        parameters["index_name"] = _fulltext_index_name(node_label, context_properties)
+        parameters["query"] = _escape_lucene(query)
+    else:
+        query_cypher = f"MATCH (n:{_safe_ident(node_label)}) RETURN [] as context LIMIT $limit"
     
-    except Exception as e:
-        logger.error(f"Exception in rag_context_retrieval: {e}")
-        return f"❌ Error retrieving RAG context: {str(e)}"
+    try:
+        rows = execute_neo4j_query(query_cypher, parameters, readonly=True)
+    except Neo4jQueryError as e:
+        missing = context_properties and _missing_fulltext_index(e, node_label, context_properties)
+        if missing:
+            return missing
+        raise
+    
+    if rows:
+        # Format the results for display
+        formatted_results = "\n\n".join(f"Context {i}:\n{format_neo4j_result(dict(zip(context_properties, record['context'])))}" for i, record in enumerate(rows, 1))
+        
+        return f"✅ RAG Context Retrieved ({len(rows)} contexts):\n\n" + formatted_results
+    else:
+        return "❌ Failed to retrieve RAG context: No result"
 
 if __name__ == "__main__":
     # print("🚀 Neo4j MCP Server v2 Starting...")
@@ -1119,5 +1536,10 @@ def rag_context_retrieval(query: str, node_label: str, context_properties: List[
     # except Exception as e:
     #     print(f"❌ Neo4j connection failed: {e}")
     
+    # Open pooled connections and compile the fixed tool queries before the first request arrives
+    # (skipped when Neo4j is unreachable, where each warmup would only wait out retries)
+    if warm_connection_pool():
+        warm_query_plans()
+    
     # Run the MCP server
     mcp.run()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Neo4j connection settings shared by the debug and setup scripts
+"""
+
+import os
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, NamedTuple, Optional
+
+class EnvSettings(NamedTuple):
+    """Neo4j connection settings; a field is None when its variable is not set."""
+    uri: Optional[str]
+    user: Optional[str]
+    password: Optional[str]
+    database: Optional[str]
+
+_NEO4J_KEYS = ("NEO4J_URI", "NEO4J_USER", "NEO4J_PASSWORD", "NEO4J_DATABASE")
+_NEO4J_VALUES = itemgetter(*_NEO4J_KEYS)
+
+@lru_cache(maxsize=1)
+def load_settings() -> EnvSettings:
+    """Parse .env once per process and return the Neo4j settings from the environment."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    try:
+        return EnvSettings(*_NEO4J_VALUES(os.environ))
+    except KeyError:
+        # At least one variable is unset; report the missing ones as None
+        return EnvSettings(*map(os.environ.get, _NEO4J_KEYS))
+
+def missing_settings() -> List[str]:
+    """Names of the Neo4j variables that are unset or empty, from the cached settings."""
+    return [key for key, value in zip(_NEO4J_KEYS, load_settings()) if not value]
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Buffered status output shared by the debug and quick-check scripts
+"""
+
+import sys
+from typing import List
+
+class StatusLog:
+    """Collect status lines and write them to stdout in one go when the phase ends."""
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+
+    def info(self, message: str) -> None:
+        self._lines.append(message)
+
+    def ok(self, message: str) -> None:
+        self._lines.append(f"✅ {message}")
+
+    def fail(self, message: str) -> None:
+        self._lines.append(f"❌ {message}")
+
+    def flush(self) -> None:
+        """Write every pending line with a single stdout write."""
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            sys.stdout.flush()
+            self._lines.clear()
+
+    def __enter__(self) -> "StatusLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
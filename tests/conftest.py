@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the Neo4j MCP Server tests
+"""
+
+import asyncio
+import socket
+import sys
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TESTS_DIR = Path(__file__).resolve().parent
+SERVER_SCRIPT = PROJECT_ROOT / "server.py"
+MINIMAL_SERVER_SCRIPT = TESTS_DIR / "minimal_server.py"
+
+# The scripts import their shared helpers (_env, _status) as top-level modules
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+from _env import load_settings
+
+NEO4J_PROBE_TIMEOUT = 0.5
+
+@pytest.fixture(scope="session")
+def neo4j_up() -> None:
+    """Skip the requesting test unless the Neo4j host accepts TCP connections; probed once per run."""
+    uri = urlparse(load_settings().uri or "bolt://localhost:7687")
+    address = (uri.hostname or "localhost", uri.port or 7687)
+    try:
+        with socket.create_connection(address, timeout=NEO4J_PROBE_TIMEOUT):
+            pass
+    except OSError as e:
+        pytest.skip(f"Neo4j is not reachable at {address[0]}:{address[1]}: {e}")
+
+@lru_cache(maxsize=None)
+def server_params(script: Path):
+    """StdioServerParameters for running an MCP server script, built once per script."""
+    from mcp import StdioServerParameters
+
+    return StdioServerParameters(
+        command="uv",
+        args=["run", "python", str(script)],
+        env={"PYTHONPATH": str(PROJECT_ROOT)},
+        cwd=str(PROJECT_ROOT)
+    )
+
+@asynccontextmanager
+async def open_mcp_session(script: Path):
+    """Spawn an MCP server script over stdio and yield (session, tools_by_name)."""
+    from mcp import ClientSession
+    from mcp.client.stdio import stdio_client
+
+    async with stdio_client(server_params(script)) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            tools_result = await session.list_tools()
+            yield session, {tool.name: tool for tool in tools_result.tools}
+
+@asynccontextmanager
+async def hosted_mcp_session(script: Path):
+    """Hold open_mcp_session open in a dedicated task, so its cancel scopes are entered and exited by the same task.
+
+    pytest-asyncio runs session fixture setup and teardown in different tasks, which anyio refuses to unwind.
+    """
+    opened = asyncio.get_running_loop().create_future()
+    stop = asyncio.Event()
+
+    async def host():
+        try:
+            async with open_mcp_session(script) as session_and_tools:
+                opened.set_result(session_and_tools)
+                await stop.wait()
+        except BaseException as e:
+            if not opened.done():
+                opened.set_exception(e)
+            raise
+
+    task = asyncio.create_task(host())
+    try:
+        yield await opened
+    finally:
+        stop.set()
+        await task
+
+@pytest.fixture(scope="session")
+async def mcp_session():
+    """One initialized session against server.py, shared by every test in the run."""
+    async with hosted_mcp_session(SERVER_SCRIPT) as session_and_tools:
+        yield session_and_tools
+
+@pytest.fixture(scope="session")
+async def minimal_mcp_session():
+    """One initialized session against tests/minimal_server.py."""
+    async with hosted_mcp_session(MINIMAL_SERVER_SCRIPT) as session_and_tools:
+        yield session_and_tools
@@ -5,158 +5,158 @@
 
 import sys
 import os
+import atexit
+import importlib
+import importlib.util
+from functools import lru_cache, wraps
+from typing import Callable
+
+from _env import load_settings
+from _status import StatusLog
+
+@lru_cache(maxsize=4)
+def _get_driver(uri: str, user: str, password: str):
+    """Build one pooled driver per connection target, closed when the interpreter exits."""
+    from neo4j import GraphDatabase
+    driver = GraphDatabase.driver(uri, auth=(user, password))
+    atexit.register(driver.close)
+    return driver
+
+def _probe(failure: str) -> Callable[[Callable[[], bool]], Callable[[], bool]]:
+    """Decorate a probe so any exception it raises is reported as ``❌ <failure>: <error>`` and counts as a failure."""
+    def decorator(func: Callable[[], bool]) -> Callable[[], bool]:
+        @wraps(func)
+        def wrapper() -> bool:
+            try:
+                return func()
+            except Exception as e:
+                print(f"❌ {failure}: {e}")
+                return False
+        return wrapper
+    return decorator
+
+# Separators and banners built once at import
+_HR40 = "=" * 40
+_HR50 = "=" * 50
+_SUMMARY_BANNER = f"\n{_HR50}\n📋 Test Results Summary:\n{_HR50}"
+
+# (module, attributes it must provide, name shown in the report); heavy packages use
+# attributes=None and are only located, not executed, since the later probes import them anyway
+_IMPORT_PROBES = [
+    ("os", (), "os"),
+    ("logging", (), "logging"),
+    ("typing", ("Optional", "Dict", "Any", "List"), "typing"),
+    ("fastmcp", None, "FastMCP"),
+    ("neo4j", None, "GraphDatabase"),
+    ("dotenv", None, "dotenv"),
+]
 
 def test_imports():
     """Test each import step by step."""
     
-    print("🔍 Debugging server.py imports...")
-    print("=" * 40)
-    
-    # Test 1: Basic Python imports
-    try:
-        import os
-        print("✅ os imported")
-    except Exception as e:
-        print(f"❌ os import failed: {e}")
-        return False
-    
-    try:
-        import logging
-        print("✅ logging imported")
-    except Exception as e:
-        print(f"❌ logging import failed: {e}")
-        return False
-    
-    try:
-        from typing import Optional, Dict, Any, List
-        print("✅ typing imported")
-    except Exception as e:
-        print(f"❌ typing import failed: {e}")
-        return False
-    
-    # Test 2: FastMCP import
-    try:
-        from fastmcp import FastMCP
-        print("✅ FastMCP imported")
-    except Exception as e:
-        print(f"❌ FastMCP import failed: {e}")
-        return False
-    
-    # Test 3: Neo4j import
-    try:
-        from neo4j import GraphDatabase
-        print("✅ GraphDatabase imported")
-    except Exception as e:
-        print(f"❌ GraphDatabase import failed: {e}")
-        return False
-    
-    # Test 4: dotenv import
-    try:
-        from dotenv import load_dotenv
-        print("✅ dotenv imported")
-    except Exception as e:
-        print(f"❌ dotenv import failed: {e}")
-        return False
-    
-    return True
+    with StatusLog() as log:
+        log.info("🔍 Debugging server.py imports...")
+        log.info(_HR40)
+        
+        # Probe every dependency from one table
+        for module_name, attributes, label in _IMPORT_PROBES:
+            try:
+                if attributes is None:
+                    if importlib.util.find_spec(module_name) is None:
+                        raise ImportError(f"No module named {module_name!r}")
+                    log.ok(f"{label} found")
+                    continue
+                module = importlib.import_module(module_name)
+                for attribute in attributes:
+                    getattr(module, attribute)
+                log.ok(f"{label} imported")
+            except Exception as e:
+                log.fail(f"{label} import failed: {e}")
+                return False
+        
+        return True
 
 def test_environment():
     """Test environment variable loading."""
     
-    print("\n🔍 Testing environment variables...")
-    print("=" * 40)
-    
-    # Check if .env file exists
-    if os.path.exists(".env"):
-        print("✅ .env file exists")
-    else:
-        print("❌ .env file missing")
-        return False
-    
-    # Try to load environment variables
-    try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        print("✅ dotenv.load_dotenv() executed")
+    with StatusLog() as log:
+        log.info("\n🔍 Testing environment variables...")
+        log.info(_HR40)
         
-        # Check environment variables
-        neo4j_uri = os.getenv("NEO4J_URI")
-        neo4j_user = os.getenv("NEO4J_USER")
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        neo4j_database = os.getenv("NEO4J_DATABASE")
+        # Check if .env file exists
+        if os.path.exists(".env"):
+            log.ok(".env file exists")
+        else:
+            log.fail(".env file missing")
+            return False
         
-        print(f"✅ NEO4J_URI: {neo4j_uri}")
-        print(f"✅ NEO4J_USER: {neo4j_user}")
-        print(f"✅ NEO4J_DATABASE: {neo4j_database}")
-        print(f"✅ NEO4J_PASSWORD: {'*' * len(neo4j_password) if neo4j_password else 'Not set'}")
+        # Try to load environment variables
+        try:
+            settings = load_settings()
+        except Exception as e:
+            log.fail(f"Error loading environment variables: {e}")
+            return False
+        log.ok("dotenv.load_dotenv() executed")
+        
+        log.ok(f"NEO4J_URI: {settings.uri}")
+        log.ok(f"NEO4J_USER: {settings.user}")
+        log.ok(f"NEO4J_DATABASE: {settings.database}")
+        log.ok(f"NEO4J_PASSWORD: {'*' * len(settings.password) if settings.password else 'Not set'}")
         
-        if all([neo4j_uri, neo4j_user, neo4j_password, neo4j_database]):
-            print("✅ All environment variables loaded")
+        if all(settings):
+            log.ok("All environment variables loaded")
             return True
         else:
-            print("❌ Some environment variables missing")
+            log.fail("Some environment variables missing")
             return False
-            
-    except Exception as e:
-        print(f"❌ Error loading environment variables: {e}")
-        return False
 
+@_probe("FastMCP server creation failed")
 def test_fastmcp_server():
     """Test FastMCP server creation."""
     
-    print("\n🔍 Testing FastMCP server creation...")
-    print("=" * 40)
-    
-    try:
+    with StatusLog() as log:
+        log.info("\n🔍 Testing FastMCP server creation...")
+        log.info(_HR40)
+        
         from fastmcp import FastMCP
         mcp = FastMCP("neo4j-mcp-server")
-        print("✅ FastMCP server created")
+        log.ok("FastMCP server created")
         return True
-    except Exception as e:
-        print(f"❌ FastMCP server creation failed: {e}")
-        return False
 
+@_probe("Neo4j connection failed")
 def test_neo4j_connection():
     """Test Neo4j connection."""
     
-    print("\n🔍 Testing Neo4j connection...")
-    print("=" * 40)
-    
-    try:
-        from neo4j import GraphDatabase
-        from dotenv import load_dotenv
-        import os
-        
-        load_dotenv()
+    with StatusLog() as log:
+        log.info("\n🔍 Testing Neo4j connection...")
+        log.info(_HR40)
         
-        uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-        user = os.getenv("NEO4J_USER", "neo4j")
-        password = os.getenv("NEO4J_PASSWORD", "C0wb0ys1!")
-        database = os.getenv("NEO4J_DATABASE", "neo4j")
+        settings = load_settings()
+        uri = settings.uri or "bolt://localhost:7687"
+        user = settings.user or "neo4j"
+        password = settings.password or "C0wb0ys1!"
+        database = settings.database or "neo4j"
         
-        print(f"Connecting to: {uri}")
-        print(f"User: {user}")
-        print(f"Database: {database}")
+        log.info(f"Connecting to: {uri}")
+        log.info(f"User: {user}")
+        log.info(f"Database: {database}")
+        # Show the target before the (possibly slow) connection attempt
+        log.flush()
         
-        driver = GraphDatabase.driver(uri, auth=(user, password))
+        driver = _get_driver(uri, user, password)
         
         with driver.session(database=database) as session:
             result = session.run("RETURN 1 as test")
             test_value = result.single()
-            print(f"✅ Neo4j connection successful: {test_value['test']}")
+            log.ok(f"Neo4j connection successful: {test_value['test']}")
         
-        driver.close()
         return True
-        
-    except Exception as e:
-        print(f"❌ Neo4j connection failed: {e}")
-        return False
 
 def main():
     """Main debug function."""
     
     print("🚀 Server.py Debug Tool")
-    print("=" * 50)
+    print(_HR50)
     
     # Test each component
     tests = [
@@ -176,28 +176,27 @@ def main():
             print(f"❌ {test_name} failed with exception: {e}")
             results.append((test_name, False))
     
-    # Summary
-    print("\n" + "=" * 50)
-    print("📋 Test Results Summary:")
-    print("=" * 50)
-    
-    all_passed = True
-    for test_name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status}: {test_name}")
-        if not result:
-            all_passed = False
-    
-    print("\n" + "=" * 50)
-    if all_passed:
-        print("🎉 All tests passed! Server.py should work correctly.")
-    else:
-        print("❌ Some tests failed. Check the errors above.")
-        print("\n💡 Common fixes:")
-        print("1. Install missing dependencies: pip install fastmcp neo4j python-dotenv")
-        print("2. Create .env file: run setup_env.py")
-        print("3. Start Neo4j database")
-        print("4. Check Neo4j connection details")
+    # Summary, written in one go
+    with StatusLog() as log:
+        log.info(_SUMMARY_BANNER)
+        
+        all_passed = True
+        for test_name, result in results:
+            status = "✅ PASS" if result else "❌ FAIL"
+            log.info(f"{status}: {test_name}")
+            if not result:
+                all_passed = False
+        
+        log.info("\n" + _HR50)
+        if all_passed:
+            log.info("🎉 All tests passed! Server.py should work correctly.")
+        else:
+            log.fail("Some tests failed. Check the errors above.")
+            log.info("\n💡 Common fixes:")
+            log.info("1. Install missing dependencies: pip install fastmcp neo4j python-dotenv")
+            log.info("2. Create .env file: run setup_env.py")
+            log.info("3. Start Neo4j database")
+            log.info("4. Check Neo4j connection details")
 
 if __name__ == "__main__":
     main()
@@ -3,42 +3,43 @@
 Quick test to verify the server is working
 """
 
-import os
 import sys
 
+from _env import load_settings
+from _status import StatusLog
+
 def test_server():
     """Test if the server can be imported and run."""
     
-    print("Testing server import...")
-    
-    try:
-        # Import the server module
-        import server
-        print("✅ Server imported successfully")
-        
-        # Check if environment variables are loaded
-        neo4j_uri = os.getenv("NEO4J_URI")
-        neo4j_user = os.getenv("NEO4J_USER")
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        neo4j_database = os.getenv("NEO4J_DATABASE")
-        
-        print(f"✅ NEO4J_URI: {neo4j_uri}")
-        print(f"✅ NEO4J_USER: {neo4j_user}")
-        print(f"✅ NEO4J_DATABASE: {neo4j_database}")
-        print(f"✅ NEO4J_PASSWORD: {'*' * len(neo4j_password) if neo4j_password else 'Not set'}")
-        
-        # Test the list_nodes function directly
-        print("\nTesting list_nodes function...")
-        result = server.list_nodes()
-        print(f"✅ list_nodes result: {result}")
-        
-        return True
+    with StatusLog() as log:
+        log.info("Testing server import...")
         
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        try:
+            # Import the server module
+            import server
+            log.ok("Server imported successfully")
+            
+            # Check if environment variables are loaded
+            settings = load_settings()
+            log.ok(f"NEO4J_URI: {settings.uri}")
+            log.ok(f"NEO4J_USER: {settings.user}")
+            log.ok(f"NEO4J_DATABASE: {settings.database}")
+            log.ok(f"NEO4J_PASSWORD: {'*' * len(settings.password) if settings.password else 'Not set'}")
+            
+            # Test the list_nodes function directly
+            log.info("\nTesting list_nodes function...")
+            log.flush()
+            result = server.list_nodes()
+            log.ok(f"list_nodes result: {result}")
+            
+            return True
+            
+        except Exception as e:
+            log.fail(f"Error: {e}")
+            log.flush()
+            import traceback
+            traceback.print_exc()
+            return False
 
 if __name__ == "__main__":
     success = test_server()
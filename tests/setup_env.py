@@ -3,12 +3,12 @@
 Setup script to create .env file for Neo4j MCP Server
 """
 
-import os
+from pathlib import Path
 
-def create_env_file():
-    """Create a .env file with default Neo4j configuration."""
-    
-    env_content = """# Neo4j Database Configuration
+from _env import load_settings
+
+# Default .env contents, kept as bytes so the file is written with a single call
+ENV_TEMPLATE_BYTES = b"""# Neo4j Database Configuration
 NEO4J_URI=bolt://localhost:7687
 NEO4J_USER=neo4j
 NEO4J_PASSWORD=C0wb0ys1!
@@ -21,16 +21,18 @@ def create_env_file():
 # MCP Server Configuration
 MCP_SERVER_NAME=neo4j-mcp-server
 """
+
+def create_env_file():
+    """Create a .env file with default Neo4j configuration."""
     
-    env_file = ".env"
+    env_file = Path(".env")
     
-    if os.path.exists(env_file):
+    if env_file.exists():
         print(f"⚠️  {env_file} already exists. Skipping creation.")
         return
     
     try:
-        with open(env_file, 'w') as f:
-            f.write(env_content)
+        env_file.write_bytes(ENV_TEMPLATE_BYTES)
         print(f"✅ Created {env_file} with default Neo4j configuration")
         print("📝 Please update the password and other settings as needed")
     except Exception as e:
@@ -42,21 +44,15 @@ def test_env_loading():
     print("\n🧪 Testing environment variable loading...")
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
         # Check if environment variables are loaded
-        neo4j_uri = os.getenv("NEO4J_URI")
-        neo4j_user = os.getenv("NEO4J_USER")
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        neo4j_database = os.getenv("NEO4J_DATABASE")
+        settings = load_settings()
         
-        print(f"✅ NEO4J_URI: {neo4j_uri}")
-        print(f"✅ NEO4J_USER: {neo4j_user}")
-        print(f"✅ NEO4J_DATABASE: {neo4j_database}")
-        print(f"✅ NEO4J_PASSWORD: {'*' * len(neo4j_password) if neo4j_password else 'Not set'}")
+        print(f"✅ NEO4J_URI: {settings.uri}")
+        print(f"✅ NEO4J_USER: {settings.user}")
+        print(f"✅ NEO4J_DATABASE: {settings.database}")
+        print(f"✅ NEO4J_PASSWORD: {'*' * len(settings.password) if settings.password else 'Not set'}")
         
-        if all([neo4j_uri, neo4j_user, neo4j_password, neo4j_database]):
+        if all(settings):
             print("✅ All required environment variables are loaded")
         else:
             print("⚠️  Some environment variables are missing")
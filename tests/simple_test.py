@@ -3,43 +3,41 @@
 Simple test to check basic functionality
 """
 
-print("Starting simple test...")
+import importlib
+import os
 
-# Test 1: Basic imports
-try:
-    import os
-    print("✅ os imported")
-except Exception as e:
-    print(f"❌ os import failed: {e}")
+from _status import StatusLog
 
-try:
-    import logging
-    print("✅ logging imported")
-except Exception as e:
-    print(f"❌ logging import failed: {e}")
+log = StatusLog()
+log.info("Starting simple test...")
 
-try:
-    from typing import Optional, Dict, Any, List
-    print("✅ typing imported")
-except Exception as e:
-    print(f"❌ typing import failed: {e}")
+# Test 1: Basic imports
+for module_name in ("os", "logging", "typing"):
+    try:
+        importlib.import_module(module_name)
+        log.ok(f"{module_name} imported")
+    except Exception as e:
+        log.fail(f"{module_name} import failed: {e}")
 
 # Test 2: Check if .env exists
 try:
     if os.path.exists(".env"):
-        print("✅ .env file exists")
+        log.ok(".env file exists")
     else:
-        print("❌ .env file missing")
+        log.fail(".env file missing")
 except Exception as e:
-    print(f"❌ Error checking .env: {e}")
+    log.fail(f"Error checking .env: {e}")
+log.flush()
 
 # Test 3: Try to import server
 try:
     import server
-    print("✅ server imported successfully")
+    log.ok("server imported successfully")
 except Exception as e:
-    print(f"❌ server import failed: {e}")
+    log.fail(f"server import failed: {e}")
+    log.flush()
     import traceback
     traceback.print_exc()
 
-print("Test completed.")
+log.info("Test completed.")
+log.flush()
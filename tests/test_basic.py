@@ -4,110 +4,186 @@
 Tests the server functions directly without MCP client
 """
 
-import sys
-import os
-sys.path.append('..')
+import asyncio
 
-def test_server_import():
-    """Test that the server can be imported."""
-    print("🧪 Testing server import...")
-    try:
-        import server
-        print("✅ Server imported successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Server import failed: {e}")
-        return False
+import pytest
 
-def test_echo_function():
-    """Test the echo function logic directly."""
-    print("\n🧪 Testing echo function logic...")
-    try:
-        import server
-        # Test the underlying logic
-        message = "Hello, World!"
-        result = f"Echo: {message}"
-        if "Hello, World!" in result:
-            print("✅ Echo function logic working correctly")
-            return True
-        else:
-            print(f"❌ Echo function logic failed: {result}")
-            return False
-    except Exception as e:
-        print(f"❌ Echo function test failed: {e}")
-        return False
+@pytest.fixture(scope="session")
+def server_module():
+    """Import the server once for the whole test session."""
+    import server
+    yield server
 
-def test_list_nodes_function():
-    """Test the list_nodes function logic directly."""
-    print("\n🧪 Testing list_nodes function logic...")
+@pytest.fixture(scope="session")
+def neo4j_server(neo4j_up, server_module):
+    """The server module, with the test skipped when Neo4j cannot be reached."""
     try:
-        import server
-        # Test the underlying logic by calling execute_neo4j_query directly
-        result = server.execute_neo4j_query("MATCH (n) RETURN count(n) as count LIMIT 1")
-        if result and len(result) > 0:
-            print("✅ List nodes function logic working correctly")
-            return True
-        else:
-            print(f"❌ List nodes function logic failed: {result}")
-            return False
+        server_module.get_driver().verify_connectivity()
     except Exception as e:
-        print(f"❌ List nodes function test failed: {e}")
-        return False
+        pytest.skip(f"Neo4j is not reachable: {e}")
+    return server_module
 
-def test_execute_query_function():
-    """Test the execute_query function logic directly."""
-    print("\n🧪 Testing execute_query function logic...")
-    try:
-        import server
-        # Test the underlying logic by calling execute_neo4j_query directly
-        result = server.execute_neo4j_query("RETURN 1 as test")
-        if result and len(result) > 0:
-            print("✅ Execute query function logic working correctly")
-            return True
-        else:
-            print(f"❌ Execute query function logic failed: {result}")
-            return False
-    except Exception as e:
-        print(f"❌ Execute query function test failed: {e}")
-        return False
-
-def main():
-    """Run all basic tests."""
-    print("🚀 Starting Basic Neo4j MCP Server Tests")
-    print("=" * 50)
-    
-    tests = [
-        ("Server Import", test_server_import),
-        ("Echo Function", test_echo_function),
-        ("List Nodes Function", test_list_nodes_function),
-        ("Execute Query Function", test_execute_query_function),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            if result:
-                passed += 1
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-    
-    # Print summary
-    print("\n" + "=" * 50)
-    print("📊 Basic Test Results Summary")
-    print("=" * 50)
-    print(f"Overall: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("\n🎉 All basic tests passed! The server functions are working correctly.")
-    else:
-        print(f"\n⚠️  {total - passed} test(s) failed. Check the errors above.")
-    
-    return passed == total
-
-if __name__ == "__main__":
-    success = main()
-    if not success:
-        sys.exit(1)
+@pytest.mark.unit
+def test_server_import(server_module):
+    """Test that the server can be imported."""
+    assert server_module.mcp is not None
+
+@pytest.mark.unit
+def test_echo_function(server_module):
+    """Test the echo tool."""
+    result = server_module.echo.fn("Hello, World!")
+    assert "Hello, World!" in result
+
+@pytest.mark.integration
+@pytest.mark.parametrize("cypher", [
+    "MATCH (n) RETURN count(n) as count LIMIT 1",
+    "RETURN 1 as test",
+])
+def test_query(neo4j_server, cypher):
+    """Test that execute_neo4j_query returns rows for the probe queries."""
+    assert neo4j_server.execute_neo4j_query(cypher)
+
+@pytest.mark.integration
+def test_basic_queries_batched(neo4j_server):
+    """Test that several probe queries can share one session and transaction."""
+    results = neo4j_server.execute_neo4j_queries_batched(
+        ["MATCH (n) RETURN count(n) as count LIMIT 1", "RETURN 1 as test"], readonly=True
+    )
+    assert len(results) == 2 and all(results)
+
+@pytest.mark.unit
+def test_graph_entities_keep_ids(server_module):
+    """Test that nodes and relationships are serialized with the id the node tools take."""
+    from neo4j.graph import Graph, Node
+    graph = Graph()
+    node = Node(graph, "4:db:12", 12, ["Person"], {"name": "x"})
+    rel = graph.relationship_type("KNOWS")(graph, "5:db:7", 7, {"since": 2020})
+    row = {"n": server_module._plain_value(node), "rels": server_module._plain_value([rel])}
+    assert row["n"] == {"id": 12, "element_id": "4:db:12", "labels": ["Person"], "properties": {"name": "x"}}
+    assert row["rels"][0]["id"] == 7 and row["rels"][0]["type"] == "KNOWS"
+    assert server_module.format_neo4j_result({"n": row["n"]}) == "n: (id: 12, Person) {name: x}"
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cypher, read_only", [
+    ("MATCH (n) RETURN n.created_at", True),
+    ("MATCH (n) WHERE n.dropped RETURN n.removed_by, n.merged_into", True),
+    ("CALL db.labels() YIELD label RETURN label", True),
+    ("MATCH (n) SET n.x = 1", False),
+    ("MATCH (n) DETACH DELETE n", False),
+    ("CREATE (n:Person)", False),
+    ("LOAD CSV FROM 'file:///x.csv' AS row RETURN row", False),
+    ("CALL db.createLabel('Draft')", False),
+    ("MATCH (n:Old) CALL apoc.refactor.setType(n, 'New') YIELD output RETURN output", False),
+    ("MATCH (a:Person), (b:Person) CALL apoc.refactor.mergeNodes([a, b]) YIELD node RETURN node", False),
+    ("CALL db.index.fulltext.queryNodes('ft_Movie_title', 'matrix') YIELD node RETURN node", True),
+])
+def test_is_read_only_query(server_module, cypher, read_only):
+    """Test that write keywords only count as whole words and write procedures are not read-only."""
+    assert server_module._is_read_only_query(cypher) is read_only
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cypher, implicit", [
+    ("LOAD CSV FROM 'file:///x.csv' AS row CALL { WITH row CREATE (:Row {v: row[0]}) } IN TRANSACTIONS OF 500 ROWS", True),
+    ("MATCH (n) CALL { WITH n DETACH DELETE n } IN 4 CONCURRENT TRANSACTIONS", True),
+    ("USING PERIODIC COMMIT 500 LOAD CSV FROM 'file:///x.csv' AS row CREATE (:Row)", True),
+    ("MATCH (n) CALL { WITH n RETURN n.name AS name } RETURN name", False),
+])
+def test_needs_implicit_transaction(server_module, cypher, implicit):
+    """Test that self-batching queries are sent down the auto-commit path."""
+    assert server_module._needs_implicit_transaction(cypher) is implicit
+
+@pytest.mark.unit
+def test_escape_lucene(server_module):
+    """Test that Lucene syntax and boolean operators in free text are escaped."""
+    assert server_module._escape_lucene("cats AND dogs") == r"cats \AND dogs"
+    assert server_module._escape_lucene('title:"x" OR (y)') == r'title\:\"x\" \OR \(y\)'
+    assert server_module._escape_lucene("android notes") == "android notes"
+
+@pytest.mark.unit
+def test_fulltext_index_name_ignores_property_order(server_module):
+    """Test that the same label/properties always map to one index name."""
+    assert server_module._fulltext_index_name("Movie", ["title", "description"]) == "ft_Movie_description_title"
+    assert server_module._fulltext_index_name("Movie", ["description", "title"]) == "ft_Movie_description_title"
+
+@pytest.mark.unit
+def test_scalar_row_template(server_module):
+    """Test that the cached row template matches format_neo4j_result for plain values."""
+    row = {"name": "x", "count": 3, "{odd}": 1.5}
+    template = server_module._scalar_row_template(tuple(row))
+    assert template.format(*row.values()) == server_module.format_neo4j_result(row)
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", ["Person", "_private", "HAS_ROLE2"])
+def test_safe_ident_accepts_identifiers(server_module, name):
+    """Test that plain identifiers pass through unchanged."""
+    assert server_module._safe_ident(name) == name
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", ["", "2fast", "a-b", "n) DETACH DELETE n //", "Person`"])
+def test_safe_ident_rejects_injection(server_module, name):
+    """Test that anything but a plain identifier is refused before it reaches Cypher."""
+    with pytest.raises(ValueError):
+        server_module._safe_ident(name)
+
+@pytest.mark.unit
+def test_build_create_cypher(server_module):
+    """Test that labels are joined and every property is bound through $props."""
+    assert server_module._build_create_cypher(("Person", "Actor")) == "CREATE (n:Person:Actor) SET n = $props RETURN n"
+    with pytest.raises(ValueError):
+        server_module._build_create_cypher(("Person", "x)-[:R]->(y"))
+
+@pytest.mark.unit
+def test_pagerank_csr(server_module):
+    """Test that PageRank sums to one and ranks the node every edge points to highest."""
+    np = pytest.importorskip("numpy")
+    # 0 -> 2, 1 -> 2, 2 -> 0; node 3 is dangling
+    indptr = np.array([0, 1, 2, 3, 3])
+    indices = np.array([2, 2, 0])
+    scores = server_module._pagerank_csr(indptr, indices)
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores.argmax() == 2
+    assert scores[1] == pytest.approx(scores[3])
+
+@pytest.mark.unit
+def test_update_node_query(server_module, monkeypatch):
+    """Test that update_node merges properties and adds labels in one parameterized statement."""
+    calls = []
+    monkeypatch.setattr(server_module, "execute_neo4j_query", lambda query, parameters: calls.append((query, parameters)) or [{"n": {}}])
+    monkeypatch.setattr(server_module, "_invalidate_read_cache", lambda: None)
+    result = server_module.update_node.fn(7, properties={"age": 30}, labels=["Actor", "Director"])
+    assert result.startswith("✅")
+    assert calls == [("MATCH (n) WHERE id(n) = $node_id SET n += $props SET n:Actor:Director RETURN n", {"node_id": 7, "props": {"age": 30}})]
+
+@pytest.mark.unit
+@pytest.mark.parametrize("apoc", [True, False])
+def test_graph_statistics_derivation(server_module, monkeypatch, apoc):
+    """Test that average degree, density and the top label/type are derived from the two counts."""
+    stats = {
+        "total_nodes": 4, "total_relationships": 6,
+        "node_labels": [{"labels": ["Person"], "count": 3}, {"labels": ["Movie"], "count": 1}],
+        "relationship_types": [{"type": "KNOWS", "count": 5}, {"type": "ACTED_IN", "count": 1}],
+    }
+    monkeypatch.setattr(server_module, "_apoc_available", lambda: apoc)
+    monkeypatch.setattr(server_module, "_MATERIALIZED_STATS", False)
+    monkeypatch.setattr(server_module, "_STATS_CACHE", {})
+    monkeypatch.setattr(server_module, "execute_neo4j_query", lambda query, readonly: [stats])
+    lines = asyncio.run(server_module.graph_statistics.fn()).splitlines()
+    assert "Node Count: total_nodes: 4" in lines
+    assert "Node Labels: labels: ['Person'] | count: 3" in lines
+    assert "Relationship Types: type: KNOWS | count: 5" in lines
+    assert "Avg Degree: avg_degree: 3.0" in lines
+    assert "Density: density: 0.5" in lines
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cypher", [
+    "CALL db.createLabel('Draft')",
+    "MATCH (n:Old) CALL apoc.refactor.setType(n, 'New') YIELD output RETURN output",
+])
+def test_execute_query_procedure_write_clears_cache(server_module, monkeypatch, cypher):
+    """Test that a procedure write runs on the writer, bypasses the read cache and clears it."""
+    calls, invalidated = [], []
+    monkeypatch.setattr(server_module, "execute_neo4j_query", lambda query, parameters, **kwargs: calls.append(kwargs) or [{"ok": True}])
+    monkeypatch.setattr(server_module, "_invalidate_read_cache", lambda: invalidated.append(True))
+    server_module.execute_query.fn(cypher)
+    assert calls[0]["readonly"] is False and calls[0]["cache_read"] is False
+    assert invalidated
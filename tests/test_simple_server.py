@@ -3,49 +3,95 @@
 Simple test to verify the server can start properly
 """
 
-import subprocess
-import time
+import asyncio
+import json
+import logging
+import tempfile
 import os
+from importlib.util import find_spec
+from pathlib import Path
 
-def test_server_startup():
+import pytest
+
+pytestmark = pytest.mark.integration
+
+logger = logging.getLogger(__name__)
+
+# MCP initialize request; the server answers it as soon as it is ready
+INITIALIZE_REQUEST = json.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "test_simple_server", "version": "0.1.0"}
+    }
+}).encode() + b"\n"
+SERVER_SCRIPT = Path(__file__).resolve().parent.parent / "server.py"
+STARTUP_TIMEOUT = 10.0
+SHUTDOWN_TIMEOUT = 5.0
+
+async def wait_until_ready(process: asyncio.subprocess.Process, timeout: float = STARTUP_TIMEOUT) -> bool:
+    """Send the initialize handshake and read stdout until the server answers, exits or times out."""
+    try:
+        process.stdin.write(INITIALIZE_REQUEST)
+        await process.stdin.drain()
+        async with asyncio.timeout(timeout):
+            async for line in process.stdout:
+                try:
+                    if json.loads(line).get("id") == 1:
+                        return True
+                except ValueError:
+                    continue
+    except (TimeoutError, ConnectionError):
+        pass
+    return False
+
+async def stop_server(process: asyncio.subprocess.Process, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """Terminate the server, killing it if it ignores SIGTERM for longer than timeout."""
+    if process.returncode is None:
+        process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=timeout)
+    except TimeoutError:
+        process.kill()
+        await process.wait()
+
+@pytest.mark.skipif(find_spec("pytest_asyncio") is None, reason="needs pytest-asyncio")
+async def test_server_startup():
     """Test if the server can start properly."""
     
-    print("🧪 Testing server startup...")
+    logger.info("🧪 Testing server startup...")
     
-    try:
+    # Server logs go to a temporary file rather than a pipe nobody drains
+    with tempfile.TemporaryFile() as stderr_file:
         # Start the server in a subprocess using uv run
-        process = subprocess.Popen(
-            ["uv", "run", "python", "server.py"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        process = await asyncio.create_subprocess_exec(
+            "uv", "run", "python", str(SERVER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=stderr_file,
+            cwd=SERVER_SCRIPT.parent
         )
         
-        # Wait a bit for the server to start
-        time.sleep(3)
+        # Wait until the server answers the initialize handshake
+        try:
+            ready = await wait_until_ready(process)
+        finally:
+            await stop_server(process)
         
-        # Check if the process is still running
-        if process.poll() is None:
-            print("✅ Server started successfully and is running")
-            
-            # Terminate the process
-            process.terminate()
-            process.wait()
-            print("✅ Server terminated cleanly")
-        else:
-            # Get output if the process failed
-            stdout, stderr = process.communicate()
-            print(f"❌ Server failed to start")
-            print(f"STDOUT: {stdout}")
-            print(f"STDERR: {stderr}")
-            
-    except Exception as e:
-        print(f"❌ Error testing server startup: {e}")
+        # Read the logs only if the process failed or never answered
+        if not ready:
+            stderr_file.seek(0)
+            pytest.fail(f"Server failed to start:\n{stderr_file.read().decode(errors='replace')}")
+    
+    logger.info("✅ Server started successfully and terminated cleanly")
 
 def test_environment_variables():
     """Test if environment variables are loaded correctly."""
     
-    print("\n🧪 Testing environment variables...")
+    logger.info("🧪 Testing environment variables...")
     
     try:
         # Import the server module to trigger dotenv loading
@@ -57,27 +103,28 @@ def test_environment_variables():
         neo4j_password = os.getenv("NEO4J_PASSWORD")
         neo4j_database = os.getenv("NEO4J_DATABASE")
         
-        print(f"✅ NEO4J_URI: {neo4j_uri}")
-        print(f"✅ NEO4J_USER: {neo4j_user}")
-        print(f"✅ NEO4J_DATABASE: {neo4j_database}")
-        print(f"✅ NEO4J_PASSWORD: {'*' * len(neo4j_password) if neo4j_password else 'Not set'}")
+        logger.info("✅ NEO4J_URI: %s", neo4j_uri)
+        logger.info("✅ NEO4J_USER: %s", neo4j_user)
+        logger.info("✅ NEO4J_DATABASE: %s", neo4j_database)
+        logger.info("✅ NEO4J_PASSWORD: %s", '*' * len(neo4j_password) if neo4j_password else 'Not set')
         
         if all([neo4j_uri, neo4j_user, neo4j_password, neo4j_database]):
-            print("✅ All environment variables loaded correctly")
+            logger.info("✅ All environment variables loaded correctly")
         else:
-            print("⚠️  Some environment variables are missing")
+            logger.warning("⚠️  Some environment variables are missing")
             
     except Exception as e:
-        print(f"❌ Error testing environment variables: {e}")
+        logger.error("❌ Error testing environment variables: %s", e)
 
 def main():
     """Main test function."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
     print("🚀 Simple Server Test")
     print("=" * 30)
     
     test_environment_variables()
-    test_server_startup()
+    asyncio.run(test_server_startup())
 
 if __name__ == "__main__":
     main()
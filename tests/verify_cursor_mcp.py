@@ -5,11 +5,11 @@
 
 import asyncio
 import os
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 
 async def verify_cursor_mcp():
     """Verify the MCP server is ready for Cursor."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
     
     print("🔍 Verifying MCP server for Cursor...")
     print("=" * 50)
@@ -7,11 +7,13 @@
 import asyncio
 import os
 import sys
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+
+from _env import missing_settings
 
 async def verify_mcp_server():
     """Verify that the MCP server is working correctly."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
     
     print("🔍 Verifying Neo4j MCP Server...")
     print("=" * 50)
@@ -25,18 +27,11 @@ async def verify_mcp_server():
     
     # Test 2: Check if environment variables are loaded
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        neo4j_uri = os.getenv("NEO4J_URI")
-        neo4j_user = os.getenv("NEO4J_USER")
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        neo4j_database = os.getenv("NEO4J_DATABASE")
-        
-        if all([neo4j_uri, neo4j_user, neo4j_password, neo4j_database]):
+        missing_vars = missing_settings()
+        if not missing_vars:
             print("✅ Environment variables loaded correctly")
         else:
-            print("❌ Some environment variables are missing")
+            print(f"❌ Missing environment variables: {missing_vars}")
             return False
     except Exception as e:
         print(f"❌ Error loading environment variables: {e}")
@@ -59,13 +54,18 @@ async def verify_mcp_server():
                 await session.initialize()
                 print("✅ MCP client connected successfully!")
                 
-                # List available tools
+                # List available tools once and reuse the result below
                 tools_result = await session.list_tools()
-                print(f"✅ Found {len(tools_result.tools)} tools:")
+                tools = {tool.name: tool for tool in tools_result.tools}
+                print(f"✅ Found {len(tools)} tools:")
                 
-                for tool in tools_result.tools:
+                for tool in tools.values():
                     print(f"  - {tool.name}: {tool.description}")
                 
+                if "list_nodes" not in tools:
+                    print("❌ list_nodes tool is not registered")
+                    return False
+                
                 # Test the list_nodes tool specifically
                 print(f"\n🧪 Testing mcp_neo4j-mcp-server_list_nodes...")
                 list_result = await session.call_tool("list_nodes", arguments={})
@@ -73,10 +73,8 @@ async def verify_mcp_server():
                 
                 print("\n🎉 MCP server is working correctly!")
                 print("📋 Tool names for Cursor:")
-                print("   - mcp_neo4j-mcp-server_list_nodes")
-                print("   - mcp_neo4j-mcp-server_echo")
-                print("   - mcp_neo4j-mcp-server_create_node")
-                print("   - etc.")
+                for tool_name in tools:
+                    print(f"   - mcp_neo4j-mcp-server_{tool_name}")
                 
                 return True
                 